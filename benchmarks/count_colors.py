@@ -0,0 +1,48 @@
+"""
+Times count_colors' engines against np.unique on random opaque pixels, at full
+precision and with channels reduced to fewer bits.
+
+    python benchmarks/count_colors.py [--pixels N ...] [--bits N ...] [--repeat N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from foocolor.quantize.histogram import count_colors
+
+
+def best_time(function, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--pixels", type=int, nargs="+", default=[100_000, 1_000_000, 12_000_000]
+    )
+    parser.add_argument("--bits", type=int, nargs="+", default=[8, 5, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for pixels in args.pixels:
+        argb = rng.integers(0, 1 << 24, pixels, dtype=np.uint32) | np.uint32(0xFF000000)
+        unique = best_time(lambda: np.unique(argb, return_counts=True), args.repeat)
+        print(f"{pixels} pixels: np.unique {unique * 1e3:.1f} ms")
+        for bits in args.bits:
+            timings = ", ".join(
+                f"{method} {best_time(lambda: count_colors(argb, bits, method), args.repeat) * 1e3:.1f} ms"
+                for method in ("sort", "dense", "auto")
+            )
+            print(f"  bits={bits}: {timings}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Times a whole-image tone inversion with transform_image against converting each
+unique color through Hct.
+
+    python benchmarks/image_transform.py [--size N] [--colors N] [--repeat N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from foocolor.hct import Hct
+from foocolor.hct.image import with_tone
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--colors", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    palette = rng.integers(0, 256, (args.colors, 4), dtype=np.uint8)
+    palette[:, 3] = 255
+    image = palette[rng.integers(0, args.colors, (args.size, args.size))]
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        with_tone(image, lambda tone: 100.0 - tone)
+        best = min(best, time.perf_counter() - start)
+    print(f"transform_image: {best * 1e3:.1f} ms")
+
+    # Per-color baseline over a sample of the unique colors, scaled up.
+    sample = palette[:1000].astype(np.uint32)
+    argbs = (
+        0xFF000000 | sample[:, 0] << 16 | sample[:, 1] << 8 | sample[:, 2]
+    ).tolist()
+    start = time.perf_counter()
+    for argb in argbs:
+        hct = Hct(argb)
+        Hct.from_(hct.hue, hct.chroma, 100.0 - hct.tone)
+    elapsed = (time.perf_counter() - start) / len(argbs) * args.colors
+    print(f"Hct per unique color: {elapsed * 1e3:.1f} ms (extrapolated)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Measures cold import cost with python -X importtime, in fresh interpreters.
+
+    python benchmarks/import_time.py [--statement S] [--repeat N] [--top N]
+
+Prints the best total time of the statement's imports, the share of it spent
+importing foocolor's own modules (excluding NumPy and the standard library),
+and the slowest foocolor modules by self time.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(statement):
+    """
+    Runs [statement] in a fresh interpreter and returns its imports as
+    (module, self microseconds, cumulative microseconds) tuples.
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=env,
+        stderr=subprocess.PIPE,
+        check=True,
+        text=True,
+    ).stderr
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statement", default="import foocolor")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    # Once untimed, so bytecode caches are written before measuring.
+    import_times(args.statement)
+    best = None
+    for _ in range(args.repeat):
+        rows = import_times(args.statement)
+        total = sum(self_us for _, self_us, _ in rows)
+        if best is None or total < best[0]:
+            best = (total, rows)
+    total, rows = best
+    own = [row for row in rows if row[0].split(".")[0] == "foocolor"]
+    print(f"{args.statement}: {total / 1e3:.1f} ms")
+    print(f"  foocolor modules: {sum(row[1] for row in own) / 1e3:.1f} ms")
+    print(f"  numpy loaded: {any(row[0] == 'numpy' for row in rows)}")
+    for module, self_us, _ in sorted(own, key=lambda row: -row[1])[: args.top]:
+        print(f"  {self_us / 1e3:6.2f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Times Scheme.light end to end for a fixed set of random seed colors.
+
+    python benchmarks/scheme_light.py [--seeds N] [--repeat N] [--stats]
+
+Rounds are timed twice: with the solve memo cleared before each, which
+measures the solver, and with the memo warm from the previous rounds.
+
+With --stats, one more untimed round runs with an empty solve memo and the
+solver's counters are printed.
+"""
+
+import argparse
+import random
+import time
+
+from foocolor import Scheme
+from foocolor.hct import solve_memo, solver_stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seeds", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--stats", action="store_true")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    seeds = [0xFF000000 | rng.getrandbits(24) for _ in range(args.seeds)]
+    # Warm up lazily built tables, such as the gamut columns of every seed's
+    # hues, so they don't count against the first round.
+    for seed in seeds:
+        Scheme.light(seed)
+
+    # Clearing the solve memo before each round times the solver itself; a
+    # warm memo shows what repeated schemes for the same seeds cost.
+    for label, clear in (("memo cleared", True), ("memo warm", False)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            if clear:
+                solve_memo.clear()
+            start = time.perf_counter()
+            for seed in seeds:
+                Scheme.light(seed)
+            best = min(best, time.perf_counter() - start)
+        print(f"Scheme.light, {label}: {best / len(seeds) * 1e3:.3f} ms per scheme")
+
+    if args.stats:
+        solve_memo.clear()
+        solver_stats.enable()
+        for seed in seeds:
+            Scheme.light(seed)
+        for name, value in solver_stats.snapshot().items():
+            if isinstance(value, float):
+                value = f"{value:.6f}"
+            print(f"  {name}: {value}")
+        solver_stats.disable()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compares the peak memory and time of quantizing a synthetic image whole with
+QuantizerCelebi and tile by tile with StreamingQuantizerCelebi. Tiles are
+generated on the fly, so the streamed image is never held in memory.
+
+    python benchmarks/streaming.py [--size N] [--tile N] [--colors N]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from foocolor.quantize import QuantizerCelebi, StreamingQuantizerCelebi
+
+
+def tiles(size, tile):
+    for y in range(0, size, tile):
+        rng = np.random.default_rng(y)
+        centers = np.random.default_rng(0).integers(0, 256, (64, 3))
+        rgb = centers[rng.integers(0, centers.shape[0], tile * size)]
+        rgb = np.clip(rgb + rng.normal(0.0, 4.0, rgb.shape), 0, 255)
+        rgba = np.full((tile * size, 4), 255, dtype=np.uint8)
+        rgba[:, :3] = rgb
+        yield rgba.reshape(tile, size, 4)
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=4096)
+    parser.add_argument("--tile", type=int, default=256)
+    parser.add_argument("--colors", type=int, default=16)
+    args = parser.parse_args()
+
+    whole, elapsed, peak = measure(
+        lambda: QuantizerCelebi(np.concatenate(list(tiles(args.size, args.tile))))
+        .quantize(args.colors)
+        .color_to_count
+    )
+    print(f"whole image: {elapsed:.2f} s, peak {peak / 2**20:.0f} MB")
+    streamed, elapsed, peak = measure(
+        lambda: StreamingQuantizerCelebi(tiles(args.size, args.tile))
+        .finalize(args.colors)
+        .color_to_count
+    )
+    print(f"streamed:    {elapsed:.2f} s, peak {peak / 2**20:.0f} MB")
+    print(f"identical results: {whole == streamed}")
+
+
+if __name__ == "__main__":
+    main()
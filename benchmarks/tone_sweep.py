@@ -0,0 +1,60 @@
+"""
+Compares Newton rounds and time for tone sweeps solved cold (the default,
+identical to solve_to_int per tone) and warm-started.
+
+    python benchmarks/tone_sweep.py [--palettes N] [--repeat N]
+"""
+
+import argparse
+import random
+import time
+
+from foocolor.hct.hct_solver import solve_to_int, solve_tone_sweep
+
+TONES = list(range(0, 101))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--palettes", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    palettes = [
+        (rng.uniform(0.0, 360.0), rng.uniform(1.0, 100.0)) for _ in range(args.palettes)
+    ]
+    # Warm up lazily built tables so they don't count against the first round.
+    solve_tone_sweep(*palettes[0], TONES)
+
+    independent = [
+        [solve_to_int(hue, chroma, tone) for tone in TONES] for hue, chroma in palettes
+    ]
+    for warm_start in (False, True):
+        stats = {}
+        results = [
+            solve_tone_sweep(hue, chroma, TONES, warm_start=warm_start, stats=stats)
+            for hue, chroma in palettes
+        ]
+        differing = sum(
+            a != b
+            for swept, expected in zip(results, independent)
+            for a, b in zip(swept, expected)
+        )
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for hue, chroma in palettes:
+                solve_tone_sweep(hue, chroma, TONES, warm_start=warm_start)
+            best = min(best, time.perf_counter() - start)
+        label = "warm" if warm_start else "cold"
+        print(
+            f"{label}: {stats['newton_rounds']} Newton rounds, "
+            f"{best / len(palettes) * 1e3:.3f} ms per sweep, "
+            f"{differing} of {len(palettes) * len(TONES)} colors differ "
+            f"from solve_to_int"
+        )
+
+
+if __name__ == "__main__":
+    main()
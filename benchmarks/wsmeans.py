@@ -0,0 +1,52 @@
+"""
+Times QuantizerWsmeans with and without bound-based pruning on a synthetic set
+of unique colors, clustered around random centers like a photo's.
+
+    python benchmarks/wsmeans.py [--colors N] [--clusters N] [--iterations N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from foocolor.quantize.wsmeans import QuantizerWsmeans
+from foocolor.quantize.wu import QuantizerWu
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--colors", type=int, default=1_000_000)
+    parser.add_argument("--clusters", type=int, default=128)
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    centers = rng.integers(0, 256, (64, 3))
+    rgb = centers[rng.integers(0, centers.shape[0], args.colors * 2)]
+    rgb = np.clip(rgb + rng.normal(0.0, 24.0, rgb.shape), 0, 255).astype(np.uint32)
+    argb = 0xFF000000 | rgb[:, 0] << 16 | rgb[:, 1] << 8 | rgb[:, 2]
+    pixels = np.unique(argb)[: args.colors]
+    rng.shuffle(pixels)
+    counts = rng.integers(1, 64, pixels.shape[0])
+    starting_clusters = list(
+        QuantizerWu(pixels, counts).quantize(args.clusters).color_to_count
+    )
+    print(f"{pixels.shape[0]} unique colors, {args.clusters} clusters")
+
+    results = {}
+    for prune in (False, True):
+        quantizer = QuantizerWsmeans(pixels, counts, prune=prune)
+        start = time.perf_counter()
+        results[prune] = quantizer.quantize(
+            args.clusters,
+            starting_clusters=starting_clusters,
+            max_iterations=args.iterations,
+        ).color_to_count
+        elapsed = time.perf_counter() - start
+        print(f"prune={prune}: {elapsed:.2f} s")
+    print(f"identical results: {results[False] == results[True]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,42 @@
-from .palettes import CorePalette, TonalPalette
-from .quantize import QuantizerCelebi
-from .scheme import Scheme
-from .score import score
+import importlib
+import sys
+from types import ModuleType
+
+# Public names and the subpackages defining them. They are imported on first
+# access, so `import foocolor` alone doesn't load NumPy or build any tables.
+_LAZY_ATTRIBUTES = {
+    "CorePalette": ".palettes",
+    "TonalPalette": ".palettes",
+    "QuantizerCelebi": ".quantize",
+    "StreamingQuantizerCelebi": ".quantize",
+    "Scheme": ".scheme",
+    "score": ".score",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class _Package(ModuleType):
+    def __setattr__(self, name, value):
+        # Importing a subpackage binds it on this module, which would shadow a
+        # lazy attribute of the same name: foocolor.score is the function, not
+        # the foocolor.score subpackage.
+        if name in _LAZY_ATTRIBUTES and isinstance(value, ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
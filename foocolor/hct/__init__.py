@@ -1,7 +1,27 @@
-from .cam16 import Cam16
-from .hct import Hct
-from .viewing_conditions import (
-    VIEWING_CONDITIONS_SRGB,
-    VIEWING_CONDITIONS_STANDARD,
-    ViewingConditions,
-)
+import importlib
+
+# Public names and the modules defining them, imported on first access so that
+# e.g. the quantizers' use of [srgb_table] doesn't load the solver.
+_LAZY_ATTRIBUTES = {
+    "Cam16": ".cam16",
+    "Hct": ".hct",
+    "HctArray": ".hct_array",
+    "VIEWING_CONDITIONS_SRGB": ".viewing_conditions",
+    "VIEWING_CONDITIONS_STANDARD": ".viewing_conditions",
+    "ViewingConditions": ".viewing_conditions",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,208 @@
+import os
+
+import numpy as np
+
+from ..util.color_util import SRGB_TO_XYZ, y_from_lstar
+from .cam16 import Cam16
+from .viewing_conditions import VIEWING_CONDITIONS_STANDARD
+
+# Bumped whenever the grid or the way it is built changes, so stale disk caches
+# are rebuilt instead of loaded.
+TABLE_VERSION = 1
+
+# The table samples every whole hue in [0, 360] and every whole tone in
+# [0, 100]; cell (hue, tone) spans one degree of hue and one unit of tone.
+HUE_COUNT = 360
+TONE_COUNT = 100
+
+# Slack applied to the largest corner of a cell before a request is declared
+# out of gamut. It covers the cusp between samples and the solver's 100.01
+# acceptance limit, with ample headroom over what random sampling requires.
+_BOUND_SCALE = 1.05
+_BOUND_OFFSET = 2.0
+
+# Hue columns are built on demand, so a process that only ever solves a handful
+# of hues pays for a handful of columns.
+_table = None
+_built = None
+_cell_bounds = [None] * HUE_COUNT
+_disk_cache_checked = False
+
+
+def _build_columns(hue_indices):
+    from .hct_solver import _bisect_to_limit_array
+
+    tones = np.arange(1, TONE_COUNT, dtype=np.float64)
+    hues = np.repeat(hue_indices.astype(np.float64), tones.shape[0])
+    tones = np.tile(tones, hue_indices.shape[0])
+    linrgb = _bisect_to_limit_array(
+        y_from_lstar(tones),
+        np.mod(hues, 360.0) / 180 * np.pi,
+        VIEWING_CONDITIONS_STANDARD,
+    )
+    xyz = linrgb @ SRGB_TO_XYZ.T
+    chroma = Cam16.from_xyz_array_in_viewing_conditions(
+        xyz[:, 0], xyz[:, 1], xyz[:, 2], VIEWING_CONDITIONS_STANDARD
+    ).chroma
+    # Tones 0 and 100 are black and white, which have no chroma.
+    columns = np.zeros((hue_indices.shape[0], TONE_COUNT + 1))
+    columns[:, 1:TONE_COUNT] = chroma.reshape(hue_indices.shape[0], -1)
+    return columns
+
+
+def _cache_file(cache_dir):
+    return os.path.join(cache_dir, f"gamut-v{TABLE_VERSION}.npy")
+
+
+def _load_or_build_all(cache_dir):
+    global _disk_cache_checked
+    _disk_cache_checked = True
+    try:
+        table = np.load(_cache_file(cache_dir))
+    except (OSError, ValueError):
+        table = None
+    if table is not None and table.shape == _table.shape:
+        _table[:] = table
+    else:
+        missing = np.flatnonzero(~_built)
+        _table[missing] = _build_columns(missing)
+        _save(cache_dir, _table)
+    _built[:] = True
+
+
+def _save(cache_dir, table):
+    # The cache is optional: if it can't be written, the next process rebuilds
+    # the table. Writing a temporary file first means readers never see a
+    # partial one.
+    path = _cache_file(cache_dir)
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            np.save(f, table)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _allocate():
+    global _table, _built
+    if _table is None:
+        _table = np.zeros((HUE_COUNT + 1, TONE_COUNT + 1))
+        _built = np.zeros(HUE_COUNT + 1, dtype=bool)
+
+
+def _ensure_hues(hue_indices):
+    _allocate()
+    missing = np.unique(hue_indices)
+    missing = missing[~_built[missing]]
+    if missing.size == 0:
+        return
+    cache_dir = os.environ.get("FOOCOLOR_CACHE_DIR")
+    if cache_dir is not None and not _disk_cache_checked:
+        _load_or_build_all(cache_dir)
+        return
+    _table[missing] = _build_columns(missing)
+    _built[missing] = True
+
+
+def _cell_bounds_for(hue_index):
+    _ensure_hues(np.array([hue_index, hue_index + 1]))
+    left = _table[hue_index]
+    right = _table[hue_index + 1]
+    corners = np.maximum(
+        np.maximum(left[:-1], left[1:]), np.maximum(right[:-1], right[1:])
+    )
+    bounds = (corners * _BOUND_SCALE + _BOUND_OFFSET).tolist()
+    _cell_bounds[hue_index] = bounds
+    return bounds
+
+
+def max_chroma_table(cache_dir=None):
+    """
+    Returns the maximum in-gamut chroma sampled at every whole hue and tone, as
+    a (HUE_COUNT + 1, TONE_COUNT + 1) array indexed by [hue, tone].
+
+    Columns are built on first use. When [cache_dir] or the FOOCOLOR_CACHE_DIR
+    environment variable names a directory, the whole table is loaded from it,
+    or built and saved there if no valid cache exists yet.
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get("FOOCOLOR_CACHE_DIR")
+    _allocate()
+    if cache_dir is not None and not _disk_cache_checked:
+        _load_or_build_all(cache_dir)
+    else:
+        _ensure_hues(np.arange(HUE_COUNT + 1))
+    table = _table.view()
+    table.flags.writeable = False
+    return table
+
+
+def max_chroma(hue, tone):
+    """
+    Returns the maximum in-gamut chroma at [hue] and [tone], bilinearly
+    interpolated from [max_chroma_table]. Accepts scalars or arrays.
+    """
+    hue = np.mod(hue, 360.0)
+    tone = np.clip(tone, 0.0, float(TONE_COUNT))
+    hue_index = np.minimum(np.floor(hue).astype(np.intp), HUE_COUNT - 1)
+    tone_index = np.minimum(np.floor(tone).astype(np.intp), TONE_COUNT - 1)
+    _ensure_hues(np.concatenate([np.ravel(hue_index), np.ravel(hue_index) + 1]))
+    hue_t = hue - hue_index
+    tone_t = tone - tone_index
+    below = _table[hue_index, tone_index] * (1 - tone_t) + (
+        _table[hue_index, tone_index + 1] * tone_t
+    )
+    above = _table[hue_index + 1, tone_index] * (1 - tone_t) + (
+        _table[hue_index + 1, tone_index + 1] * tone_t
+    )
+    return below * (1 - hue_t) + above * hue_t
+
+
+def is_out_of_gamut(hue, chroma, tone):
+    """
+    Returns whether [chroma] is certainly unreachable at [hue] and [tone].
+
+    False negatives are expected near the gamut boundary; a True result means
+    the solver's Newton iteration would reject the request.
+    """
+    hue_index = int(hue % 360.0)
+    tone_index = int(tone)
+    if hue_index >= HUE_COUNT:
+        hue_index = HUE_COUNT - 1
+    if tone_index >= TONE_COUNT:
+        tone_index = TONE_COUNT - 1
+    elif tone_index < 0:
+        tone_index = 0
+    bounds = _cell_bounds[hue_index]
+    if bounds is None:
+        bounds = _cell_bounds_for(hue_index)
+    return chroma > bounds[tone_index]
+
+
+def is_out_of_gamut_array(hue, chroma, tone):
+    """
+    Vectorized [is_out_of_gamut].
+    """
+    hue_index = np.minimum(np.mod(hue, 360.0).astype(np.intp), HUE_COUNT - 1)
+    tone_index = np.clip(np.asarray(tone).astype(np.intp), 0, TONE_COUNT - 1)
+    _ensure_hues(np.concatenate([np.ravel(hue_index), np.ravel(hue_index) + 1]))
+    corners = np.maximum(
+        np.maximum(_table[hue_index, tone_index], _table[hue_index, tone_index + 1]),
+        np.maximum(
+            _table[hue_index + 1, tone_index], _table[hue_index + 1, tone_index + 1]
+        ),
+    )
+    return chroma > corners * _BOUND_SCALE + _BOUND_OFFSET
+
+
+def clamp_chroma(hue, chroma, tone):
+    """
+    Returns [chroma] limited to the interpolated [max_chroma] at [hue] and
+    [tone].
+    """
+    return np.minimum(chroma, max_chroma(hue, tone))
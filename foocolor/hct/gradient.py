@@ -0,0 +1,59 @@
+import numpy as np
+
+from ..util.math_util import difference_degrees, rotation_direction
+from .hct_array import HctArray
+from .hct_solver import solve_to_int_array
+
+
+def gradients(start, end, steps, viewing_conditions=None):
+    """
+    Returns an (N, [steps]) uint32 array of ARGB ints, each row running from a
+    color of [start] to the matching color of [end].
+
+    [start] and [end] are arrays of N ARGB ints or [HctArray]s. Hue moves along
+    the shorter arc between the two ends, and chroma and tone move linearly.
+    The two end columns are the input colors themselves, and every step in
+    between is solved in a single batch.
+    """
+    start = _hct_array(start, viewing_conditions)
+    end = _hct_array(end, start.viewing_conditions)
+    if len(start) != len(end):
+        raise ValueError(f"got {len(start)} start colors and {len(end)} end colors")
+    if steps < 2:
+        raise ValueError(f"steps must be at least 2, got {steps}")
+    t = np.linspace(0.0, 1.0, steps)
+    hue_delta = rotation_direction(start.hue, end.hue) * difference_degrees(
+        start.hue, end.hue
+    )
+    hue = (start.hue[:, None] + hue_delta[:, None] * t) % 360.0
+    chroma = start.chroma[:, None] + (end.chroma - start.chroma)[:, None] * t
+    tone = start.tone[:, None] + (end.tone - start.tone)[:, None] * t
+    argb = np.empty((len(start), steps), dtype=np.uint32)
+    argb[:, 0] = start.argb
+    argb[:, -1] = end.argb
+    argb[:, 1:-1] = solve_to_int_array(
+        hue[:, 1:-1],
+        chroma[:, 1:-1],
+        tone[:, 1:-1],
+        viewing_conditions=start.viewing_conditions,
+    ).reshape(len(start), steps - 2)
+    return argb
+
+
+def gradient(start, end, steps, viewing_conditions=None):
+    """
+    Returns [gradients] for a single pair of ARGB ints, as a one-dimensional
+    array.
+    """
+    return gradients([start], [end], steps, viewing_conditions)[0]
+
+
+def _hct_array(colors, viewing_conditions):
+    if isinstance(colors, HctArray):
+        if (
+            viewing_conditions is not None
+            and colors.viewing_conditions is not viewing_conditions
+        ):
+            raise ValueError("colors are in different viewing conditions")
+        return colors
+    return HctArray(np.asarray(colors, dtype=np.uint32).reshape(-1), viewing_conditions)
@@ -1,31 +1,82 @@
-from foocolor.hct.cam16 import Cam16
+from foocolor.hct import srgb_table
+from foocolor.hct.cam16 import hue_and_chroma_from_xyz
 from foocolor.hct.hct_solver import solve_to_int
-from foocolor.util.color_util import lstar_from_argb
+from foocolor.hct.viewing_conditions import VIEWING_CONDITIONS_SRGB
+from foocolor.util.color_util import lstar_from_y, xyz_from_argb
 
 
 class Hct:
-    def __init__(self, argb: int):
+    """
+    A color in the HCT (hue, chroma, tone) color space, backed by its ARGB int.
+
+    Only the ARGB int is stored up front. Hue, chroma and tone are computed
+    together the first time any of them is read, so colors that are only
+    created to be turned into ARGB (as [TonalPalette] does) never pay for the
+    forward CAM16 model.
+
+    Hue and chroma are those seen under [viewing_conditions], which default to
+    the standard sRGB conditions.
+    """
+
+    __slots__ = ("_argb", "_hue", "_chroma", "_tone", "_viewing_conditions")
+
+    def __init__(self, argb: int, viewing_conditions=None):
         self._argb = argb
-        cam16 = Cam16.from_int(argb)
-        self._hue = cam16.hue
-        self._chroma = cam16.chroma
-        self._tone = lstar_from_argb(argb)
+        self._hue = None
+        self._chroma = None
+        self._tone = None
+        self._viewing_conditions = viewing_conditions or VIEWING_CONDITIONS_SRGB
 
     @classmethod
-    def from_(cls, hue, chroma, tone):
-        argb = solve_to_int(hue, chroma, tone)
-        return Hct(argb)
+    def from_(cls, hue, chroma, tone, viewing_conditions=None):
+        # The solver rounds to 8-bit channels, so the returned color's own hue,
+        # chroma and tone differ slightly from the request; they are derived
+        # from the ARGB int on demand.
+        viewing_conditions = viewing_conditions or VIEWING_CONDITIONS_SRGB
+        return cls(
+            solve_to_int(hue, chroma, tone, viewing_conditions=viewing_conditions),
+            viewing_conditions,
+        )
+
+    @property
+    def viewing_conditions(self):
+        return self._viewing_conditions
+
+    def _resolve(self):
+        # The table holds values for the standard conditions only.
+        table = (
+            srgb_table.get_table()
+            if self._viewing_conditions is VIEWING_CONDITIONS_SRGB
+            else None
+        )
+        if table is not None:
+            hue, chroma, tone = table.hct(self._argb)
+            self._hue = float(hue)
+            self._chroma = float(chroma)
+            self._tone = float(tone)
+            return
+        x, y, z = xyz_from_argb(self._argb)
+        self._hue, self._chroma = hue_and_chroma_from_xyz(
+            x, y, z, self._viewing_conditions
+        )
+        self._tone = lstar_from_y(y)
 
     @property
     def hue(self):
+        if self._hue is None:
+            self._resolve()
         return self._hue
 
     @property
     def chroma(self):
+        if self._chroma is None:
+            self._resolve()
         return self._chroma
 
     @property
     def tone(self):
+        if self._tone is None:
+            self._resolve()
         return self._tone
 
     @property
@@ -33,7 +84,13 @@ class Hct:
         return self._argb
 
     def __eq__(self, other):
-        return self._argb == other._argb
+        return (
+            self._argb == other._argb
+            and self._viewing_conditions is other._viewing_conditions
+        )
+
+    def __hash__(self):
+        return hash(self._argb)
 
     def __repr__(self):
-        return f"Hct({self._hue}, {self._chroma}, {self._tone}, {self._argb})"
+        return f"Hct({self.hue}, {self.chroma}, {self.tone}, {self._argb})"
@@ -0,0 +1,189 @@
+import numpy as np
+
+from ..util.color_util import lstar_from_y, xyz_from_argb_array
+from . import srgb_table
+from .cam16 import Cam16
+from .hct import Hct
+from .hct_solver import solve_to_int_array
+from .viewing_conditions import VIEWING_CONDITIONS_SRGB
+
+
+def _read_only(array):
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+class HctArray:
+    """
+    A one-dimensional collection of HCT colors stored as columns: a uint32 array
+    of ARGB ints and float64 arrays of their hue, chroma and tone.
+
+    Indexing with an int returns an [Hct]; slices, index arrays and boolean
+    masks return another [HctArray]. The [with_hue], [with_chroma], [with_tone]
+    and [with_hct] methods return edited copies, solving only the colors whose
+    requested hue, chroma or tone actually changed.
+    """
+
+    __slots__ = ("_argb", "_hue", "_chroma", "_tone", "_viewing_conditions")
+
+    def __init__(self, argb, viewing_conditions=None):
+        argb = np.asarray(argb, dtype=np.uint32)
+        if argb.ndim != 1:
+            raise ValueError(f"expected a one-dimensional array, got {argb.ndim}")
+        self._viewing_conditions = viewing_conditions or VIEWING_CONDITIONS_SRGB
+        self._argb = argb
+        self._hue, self._chroma, self._tone = self._hct_of(argb)
+
+    @classmethod
+    def _from_columns(cls, argb, hue, chroma, tone, viewing_conditions):
+        array = cls.__new__(cls)
+        array._argb = argb
+        array._hue = hue
+        array._chroma = chroma
+        array._tone = tone
+        array._viewing_conditions = viewing_conditions
+        return array
+
+    @classmethod
+    def from_(cls, hue, chroma, tone, viewing_conditions=None):
+        """
+        Solves arrays of [hue], [chroma] and [tone] to colors, like [Hct.from_].
+        """
+        viewing_conditions = viewing_conditions or VIEWING_CONDITIONS_SRGB
+        argb = solve_to_int_array(
+            hue, chroma, tone, viewing_conditions=viewing_conditions
+        )
+        return cls(argb.ravel(), viewing_conditions)
+
+    def _hct_of(self, argb):
+        # The table holds values for the standard conditions only.
+        if self._viewing_conditions is VIEWING_CONDITIONS_SRGB:
+            table = srgb_table.get_table()
+            if table is not None:
+                hue, chroma, tone = table.hct(argb)
+                return (
+                    hue.astype(np.float64),
+                    chroma.astype(np.float64),
+                    tone.astype(np.float64),
+                )
+        xyz = xyz_from_argb_array(argb)
+        cam = Cam16.from_xyz_array_in_viewing_conditions(
+            xyz[..., 0], xyz[..., 1], xyz[..., 2], self._viewing_conditions
+        )
+        return cam.hue, cam.chroma, lstar_from_y(xyz[..., 1])
+
+    @property
+    def argb(self):
+        """
+        The ARGB column, as a read-only view rather than a copy.
+        """
+        return _read_only(self._argb)
+
+    @property
+    def hue(self):
+        return _read_only(self._hue)
+
+    @property
+    def chroma(self):
+        return _read_only(self._chroma)
+
+    @property
+    def tone(self):
+        return _read_only(self._tone)
+
+    @property
+    def viewing_conditions(self):
+        return self._viewing_conditions
+
+    def __len__(self):
+        return self._argb.shape[0]
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            hct = Hct(int(self._argb[key]), self._viewing_conditions)
+            hct._hue = float(self._hue[key])
+            hct._chroma = float(self._chroma[key])
+            hct._tone = float(self._tone[key])
+            return hct
+        if isinstance(key, tuple):
+            raise IndexError("HctArray is one-dimensional")
+        return self._from_columns(
+            self._argb[key],
+            self._hue[key],
+            self._chroma[key],
+            self._tone[key],
+            self._viewing_conditions,
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def _with(self, hue, chroma, tone):
+        hue, chroma, tone = np.broadcast_arrays(hue, chroma, tone)
+        changed = np.flatnonzero(
+            (hue != self._hue) | (chroma != self._chroma) | (tone != self._tone)
+        )
+        argb = self._argb.copy()
+        argb[changed] = solve_to_int_array(
+            hue[changed],
+            chroma[changed],
+            tone[changed],
+            viewing_conditions=self._viewing_conditions,
+        )
+        new_hue = self._hue.copy()
+        new_chroma = self._chroma.copy()
+        new_tone = self._tone.copy()
+        (
+            new_hue[changed],
+            new_chroma[changed],
+            new_tone[changed],
+        ) = self._hct_of(argb[changed])
+        return self._from_columns(
+            argb, new_hue, new_chroma, new_tone, self._viewing_conditions
+        )
+
+    def with_hct(self, hue, chroma, tone):
+        """
+        Returns a copy with [hue], [chroma] and [tone] (scalars or arrays)
+        replacing each color's own.
+        """
+        return self._with(
+            np.asarray(hue, dtype=np.float64),
+            np.asarray(chroma, dtype=np.float64),
+            np.asarray(tone, dtype=np.float64),
+        )
+
+    def with_hue(self, hue):
+        """
+        Returns a copy with [hue] (a scalar or an array) replacing each color's
+        hue, keeping its chroma and tone.
+        """
+        return self._with(np.asarray(hue, dtype=np.float64), self._chroma, self._tone)
+
+    def with_chroma(self, chroma):
+        """
+        Returns a copy with [chroma] (a scalar or an array) replacing each
+        color's chroma, keeping its hue and tone.
+        """
+        return self._with(self._hue, np.asarray(chroma, dtype=np.float64), self._tone)
+
+    def with_tone(self, tone):
+        """
+        Returns a copy with [tone] (a scalar or an array) replacing each color's
+        tone, keeping its hue and chroma.
+        """
+        return self._with(self._hue, self._chroma, np.asarray(tone, dtype=np.float64))
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, HctArray)
+            and self._viewing_conditions is other._viewing_conditions
+            and np.array_equal(self._argb, other._argb)
+        )
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"HctArray({len(self)} colors)"
@@ -1,8 +1,18 @@
+import math
+import time
+
 import numpy as np
 from foocolor.hct.viewing_conditions import VIEWING_CONDITIONS_STANDARD
 from foocolor.util.math_util import sanitize_degrees
 
-from ..util.color_util import argb_from_linrgb, argb_from_lstar, y_from_lstar
+from ..util.color_util import (
+    argb_from_linrgb,
+    argb_from_linrgb_array,
+    argb_from_lstar,
+    argb_from_lstar_array,
+    y_from_lstar,
+)
+from . import gamut, solve_memo, solver_stats
 from .cam16 import Cam16, ViewingConditions
 
 SCALED_DISCOUNT_FROM_LINRGB = np.array(
@@ -23,269 +33,293 @@ LINRGB_FROM_SCALED_DISCOUNT = np.array(
 
 Y_FROM_LINRGB = np.array([0.2126, 0.7152, 0.0722])
 
-CRITICAL_PLANES = np.array(
-    [
-        0.015176349177441876,
-        0.045529047532325624,
-        0.07588174588720938,
-        0.10623444424209313,
-        0.13658714259697685,
-        0.16693984095186062,
-        0.19729253930674434,
-        0.2276452376616281,
-        0.2579979360165119,
-        0.28835063437139563,
-        0.3188300904430532,
-        0.350925934958123,
-        0.3848314933096426,
-        0.42057480301049466,
-        0.458183274052838,
-        0.4976837250274023,
-        0.5391024159806381,
-        0.5824650784040898,
-        0.6277969426914107,
-        0.6751227633498623,
-        0.7244668422128921,
-        0.775853049866786,
-        0.829304845476233,
-        0.8848452951698498,
-        0.942497089126609,
-        1.0022825574869039,
-        1.0642236851973577,
-        1.1283421258858297,
-        1.1946592148522128,
-        1.2631959812511864,
-        1.3339731595349034,
-        1.407011200216447,
-        1.4823302800086415,
-        1.5599503113873272,
-        1.6398909516233677,
-        1.7221716113234105,
-        1.8068114625156377,
-        1.8938294463134073,
-        1.9832442801866852,
-        2.075074464868551,
-        2.1693382909216234,
-        2.2660538449872063,
-        2.36523901573795,
-        2.4669114995532007,
-        2.5710888059345764,
-        2.6777882626779785,
-        2.7870270208169257,
-        2.898822059350997,
-        3.0131901897720907,
-        3.1301480604002863,
-        3.2497121605402226,
-        3.3718988244681087,
-        3.4967242352587946,
-        3.624204428461639,
-        3.754355295633311,
-        3.887192587735158,
-        4.022731918402185,
-        4.160988767090289,
-        4.301978482107941,
-        4.445716283538092,
-        4.592217266055746,
-        4.741496401646282,
-        4.893568542229298,
-        5.048448422192488,
-        5.20615066083972,
-        5.3666897647573375,
-        5.5300801301023865,
-        5.696336044816294,
-        5.865471690767354,
-        6.037501145825082,
-        6.212438385869475,
-        6.390297286737924,
-        6.571091626112461,
-        6.7548350853498045,
-        6.941541251256611,
-        7.131223617812143,
-        7.323895587840543,
-        7.5195704746346665,
-        7.7182615035334345,
-        7.919981813454504,
-        8.124744458384042,
-        8.332562408825165,
-        8.543448553206703,
-        8.757415699253682,
-        8.974476575321063,
-        9.194643831691977,
-        9.417930041841839,
-        9.644347703669503,
-        9.873909240696694,
-        10.106627003236781,
-        10.342513269534024,
-        10.58158024687427,
-        10.8238400726681,
-        11.069304815507364,
-        11.317986476196008,
-        11.569896988756009,
-        11.825048221409341,
-        12.083451977536606,
-        12.345119996613247,
-        12.610063955123938,
-        12.878295467455942,
-        13.149826086772048,
-        13.42466730586372,
-        13.702830557985108,
-        13.984327217668513,
-        14.269168601521828,
-        14.55736596900856,
-        14.848930523210871,
-        15.143873411576273,
-        15.44220572664832,
-        15.743938506781891,
-        16.04908273684337,
-        16.35764934889634,
-        16.66964922287304,
-        16.985093187232053,
-        17.30399201960269,
-        17.62635644741625,
-        17.95219714852476,
-        18.281524751807332,
-        18.614349837764564,
-        18.95068293910138,
-        19.290534541298456,
-        19.633915083172692,
-        19.98083495742689,
-        20.331304511189067,
-        20.685334046541502,
-        21.042933821039977,
-        21.404114048223256,
-        21.76888489811322,
-        22.137256497705877,
-        22.50923893145328,
-        22.884842241736916,
-        23.264076429332462,
-        23.6469514538663,
-        24.033477234264016,
-        24.42366364919083,
-        24.817520537484558,
-        25.21505769858089,
-        25.61628489293138,
-        26.021211842414342,
-        26.429848230738664,
-        26.842203703840827,
-        27.258287870275353,
-        27.678110301598522,
-        28.10168053274597,
-        28.529008062403893,
-        28.96010235337422,
-        29.39497283293396,
-        29.83362889318845,
-        30.276079891419332,
-        30.722335150426627,
-        31.172403958865512,
-        31.62629557157785,
-        32.08401920991837,
-        32.54558406207592,
-        33.010999283389665,
-        33.4802739966603,
-        33.953417292456834,
-        34.430438229418264,
-        34.911345834551085,
-        35.39614910352207,
-        35.88485700094671,
-        36.37747846067349,
-        36.87402238606382,
-        37.37449765026789,
-        37.87891309649659,
-        38.38727753828926,
-        38.89959975977785,
-        39.41588851594697,
-        39.93615253289054,
-        40.460400508064545,
-        40.98864111053629,
-        41.520882981230194,
-        42.05713473317016,
-        42.597404951718396,
-        43.141702194811224,
-        43.6900349931913,
-        44.24241185063697,
-        44.798841244188324,
-        45.35933162437017,
-        45.92389141541209,
-        46.49252901546552,
-        47.065252796817916,
-        47.64207110610409,
-        48.22299226451468,
-        48.808024568002054,
-        49.3971762874833,
-        49.9904556690408,
-        50.587870934119984,
-        51.189430279724725,
-        51.79514187861014,
-        52.40501387947288,
-        53.0190544071392,
-        53.637271562750364,
-        54.259673423945976,
-        54.88626804504493,
-        55.517063457223934,
-        56.15206766869424,
-        56.79128866487574,
-        57.43473440856916,
-        58.08241284012621,
-        58.734331877617365,
-        59.39049941699807,
-        60.05092333227251,
-        60.715611475655585,
-        61.38457167773311,
-        62.057811747619894,
-        62.7353394731159,
-        63.417162620860914,
-        64.10328893648692,
-        64.79372614476921,
-        65.48848194977529,
-        66.18756403501224,
-        66.89098006357258,
-        67.59873767827808,
-        68.31084450182222,
-        69.02730813691093,
-        69.74813616640164,
-        70.47333615344107,
-        71.20291564160104,
-        71.93688215501312,
-        72.67524319850172,
-        73.41800625771542,
-        74.16517879925733,
-        74.9167682708136,
-        75.67278210128072,
-        76.43322770089146,
-        77.1981124613393,
-        77.96744375590167,
-        78.74122893956174,
-        79.51947534912904,
-        80.30219030335869,
-        81.08938110306934,
-        81.88105503125999,
-        82.67721935322541,
-        83.4778813166706,
-        84.28304815182372,
-        85.09272707154808,
-        85.90692527145302,
-        86.72564993000343,
-        87.54890820862819,
-        88.3767072518277,
-        89.2090541872801,
-        90.04595612594655,
-        90.88742016217518,
-        91.73345337380438,
-        92.58406282226491,
-        93.43925555268066,
-        94.29903859396902,
-        95.16341895893969,
-        96.03240364439274,
-        96.9059996312159,
-        97.78421388448044,
-        98.6670533535366,
-        99.55452497210776,
-    ]
-)
+# The linear RGB coordinates, out of 100, halfway between consecutive 8-bit
+# sRGB values. [CRITICAL_PLANES] is the same table as an array, built on first
+# use.
+_CRITICAL_PLANES_LIST = [
+    0.015176349177441876,
+    0.045529047532325624,
+    0.07588174588720938,
+    0.10623444424209313,
+    0.13658714259697685,
+    0.16693984095186062,
+    0.19729253930674434,
+    0.2276452376616281,
+    0.2579979360165119,
+    0.28835063437139563,
+    0.3188300904430532,
+    0.350925934958123,
+    0.3848314933096426,
+    0.42057480301049466,
+    0.458183274052838,
+    0.4976837250274023,
+    0.5391024159806381,
+    0.5824650784040898,
+    0.6277969426914107,
+    0.6751227633498623,
+    0.7244668422128921,
+    0.775853049866786,
+    0.829304845476233,
+    0.8848452951698498,
+    0.942497089126609,
+    1.0022825574869039,
+    1.0642236851973577,
+    1.1283421258858297,
+    1.1946592148522128,
+    1.2631959812511864,
+    1.3339731595349034,
+    1.407011200216447,
+    1.4823302800086415,
+    1.5599503113873272,
+    1.6398909516233677,
+    1.7221716113234105,
+    1.8068114625156377,
+    1.8938294463134073,
+    1.9832442801866852,
+    2.075074464868551,
+    2.1693382909216234,
+    2.2660538449872063,
+    2.36523901573795,
+    2.4669114995532007,
+    2.5710888059345764,
+    2.6777882626779785,
+    2.7870270208169257,
+    2.898822059350997,
+    3.0131901897720907,
+    3.1301480604002863,
+    3.2497121605402226,
+    3.3718988244681087,
+    3.4967242352587946,
+    3.624204428461639,
+    3.754355295633311,
+    3.887192587735158,
+    4.022731918402185,
+    4.160988767090289,
+    4.301978482107941,
+    4.445716283538092,
+    4.592217266055746,
+    4.741496401646282,
+    4.893568542229298,
+    5.048448422192488,
+    5.20615066083972,
+    5.3666897647573375,
+    5.5300801301023865,
+    5.696336044816294,
+    5.865471690767354,
+    6.037501145825082,
+    6.212438385869475,
+    6.390297286737924,
+    6.571091626112461,
+    6.7548350853498045,
+    6.941541251256611,
+    7.131223617812143,
+    7.323895587840543,
+    7.5195704746346665,
+    7.7182615035334345,
+    7.919981813454504,
+    8.124744458384042,
+    8.332562408825165,
+    8.543448553206703,
+    8.757415699253682,
+    8.974476575321063,
+    9.194643831691977,
+    9.417930041841839,
+    9.644347703669503,
+    9.873909240696694,
+    10.106627003236781,
+    10.342513269534024,
+    10.58158024687427,
+    10.8238400726681,
+    11.069304815507364,
+    11.317986476196008,
+    11.569896988756009,
+    11.825048221409341,
+    12.083451977536606,
+    12.345119996613247,
+    12.610063955123938,
+    12.878295467455942,
+    13.149826086772048,
+    13.42466730586372,
+    13.702830557985108,
+    13.984327217668513,
+    14.269168601521828,
+    14.55736596900856,
+    14.848930523210871,
+    15.143873411576273,
+    15.44220572664832,
+    15.743938506781891,
+    16.04908273684337,
+    16.35764934889634,
+    16.66964922287304,
+    16.985093187232053,
+    17.30399201960269,
+    17.62635644741625,
+    17.95219714852476,
+    18.281524751807332,
+    18.614349837764564,
+    18.95068293910138,
+    19.290534541298456,
+    19.633915083172692,
+    19.98083495742689,
+    20.331304511189067,
+    20.685334046541502,
+    21.042933821039977,
+    21.404114048223256,
+    21.76888489811322,
+    22.137256497705877,
+    22.50923893145328,
+    22.884842241736916,
+    23.264076429332462,
+    23.6469514538663,
+    24.033477234264016,
+    24.42366364919083,
+    24.817520537484558,
+    25.21505769858089,
+    25.61628489293138,
+    26.021211842414342,
+    26.429848230738664,
+    26.842203703840827,
+    27.258287870275353,
+    27.678110301598522,
+    28.10168053274597,
+    28.529008062403893,
+    28.96010235337422,
+    29.39497283293396,
+    29.83362889318845,
+    30.276079891419332,
+    30.722335150426627,
+    31.172403958865512,
+    31.62629557157785,
+    32.08401920991837,
+    32.54558406207592,
+    33.010999283389665,
+    33.4802739966603,
+    33.953417292456834,
+    34.430438229418264,
+    34.911345834551085,
+    35.39614910352207,
+    35.88485700094671,
+    36.37747846067349,
+    36.87402238606382,
+    37.37449765026789,
+    37.87891309649659,
+    38.38727753828926,
+    38.89959975977785,
+    39.41588851594697,
+    39.93615253289054,
+    40.460400508064545,
+    40.98864111053629,
+    41.520882981230194,
+    42.05713473317016,
+    42.597404951718396,
+    43.141702194811224,
+    43.6900349931913,
+    44.24241185063697,
+    44.798841244188324,
+    45.35933162437017,
+    45.92389141541209,
+    46.49252901546552,
+    47.065252796817916,
+    47.64207110610409,
+    48.22299226451468,
+    48.808024568002054,
+    49.3971762874833,
+    49.9904556690408,
+    50.587870934119984,
+    51.189430279724725,
+    51.79514187861014,
+    52.40501387947288,
+    53.0190544071392,
+    53.637271562750364,
+    54.259673423945976,
+    54.88626804504493,
+    55.517063457223934,
+    56.15206766869424,
+    56.79128866487574,
+    57.43473440856916,
+    58.08241284012621,
+    58.734331877617365,
+    59.39049941699807,
+    60.05092333227251,
+    60.715611475655585,
+    61.38457167773311,
+    62.057811747619894,
+    62.7353394731159,
+    63.417162620860914,
+    64.10328893648692,
+    64.79372614476921,
+    65.48848194977529,
+    66.18756403501224,
+    66.89098006357258,
+    67.59873767827808,
+    68.31084450182222,
+    69.02730813691093,
+    69.74813616640164,
+    70.47333615344107,
+    71.20291564160104,
+    71.93688215501312,
+    72.67524319850172,
+    73.41800625771542,
+    74.16517879925733,
+    74.9167682708136,
+    75.67278210128072,
+    76.43322770089146,
+    77.1981124613393,
+    77.96744375590167,
+    78.74122893956174,
+    79.51947534912904,
+    80.30219030335869,
+    81.08938110306934,
+    81.88105503125999,
+    82.67721935322541,
+    83.4778813166706,
+    84.28304815182372,
+    85.09272707154808,
+    85.90692527145302,
+    86.72564993000343,
+    87.54890820862819,
+    88.3767072518277,
+    89.2090541872801,
+    90.04595612594655,
+    90.88742016217518,
+    91.73345337380438,
+    92.58406282226491,
+    93.43925555268066,
+    94.29903859396902,
+    95.16341895893969,
+    96.03240364439274,
+    96.9059996312159,
+    97.78421388448044,
+    98.6670533535366,
+    99.55452497210776,
+]
+
+
+# Plain-float copies of the tables above for the per-color solver, which stays
+# in pure Python; NumPy only pays off on the batch paths. The matrices between
+# linear RGB and scaled discounted cone responses depend on the viewing
+# conditions and come from their [Coefficients].
+_K_R, _K_G, _K_B = Y_FROM_LINRGB.tolist()
+
+_critical_planes = None
+
+
+def _critical_planes_array():
+    global _critical_planes
+    if _critical_planes is None:
+        _critical_planes = np.array(_CRITICAL_PLANES_LIST)
+        _critical_planes.flags.writeable = False
+    return _critical_planes
+
+
+def __getattr__(name):
+    if name == "CRITICAL_PLANES":
+        return _critical_planes_array()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def sanitize_radians(angle):
-    return (angle + np.pi * 8) % (np.pi * 2)
+    return (angle + math.pi * 8) % (math.pi * 2)
 
 
 def true_delinearized(rgb_component):
@@ -298,20 +332,26 @@ def true_delinearized(rgb_component):
 
 
 def chromatic_adaptation(component):
+    if isinstance(component, float):
+        af = abs(component) ** 0.42
+        return _signum(component) * 400.0 * af / (af + 27.13)
     af = np.abs(component) ** 0.42
     return np.sign(component) * 400.0 * af / (af + 27.13)
 
 
-def hue_of(linrgb):
-    scaled_discount = linrgb @ SCALED_DISCOUNT_FROM_LINRGB.T
-    r_a = chromatic_adaptation(scaled_discount[0])
-    g_a = chromatic_adaptation(scaled_discount[1])
-    b_a = chromatic_adaptation(scaled_discount[2])
+def hue_of(linrgb, viewing_conditions=VIEWING_CONDITIONS_STANDARD):
+    if isinstance(linrgb, np.ndarray) and linrgb.ndim > 1:
+        return _hue_of_array(linrgb, viewing_conditions)
+    r, g, b = linrgb
+    m = viewing_conditions.coefficients.scaled_discount_from_linrgb
+    r_a = chromatic_adaptation(m[0][0] * r + m[0][1] * g + m[0][2] * b)
+    g_a = chromatic_adaptation(m[1][0] * r + m[1][1] * g + m[1][2] * b)
+    b_a = chromatic_adaptation(m[2][0] * r + m[2][1] * g + m[2][2] * b)
     # redness-greenness
     a = (11.0 * r_a - 12.0 * g_a + b_a) / 11.0
     # yellowness-blueness
     b = (r_a + g_a - 2.0 * b_a) / 9.0
-    return np.arctan2(b, a)
+    return math.atan2(b, a)
 
 
 def are_in_cyclic_order(a, b, c):
@@ -342,9 +382,9 @@ def is_bounded(x):
 
 
 def nth_vertex(y, n):
-    k_r = Y_FROM_LINRGB[0]
-    k_g = Y_FROM_LINRGB[1]
-    k_b = Y_FROM_LINRGB[2]
+    k_r = _K_R
+    k_g = _K_G
+    k_b = _K_B
     coord_a = 0.0 if n % 4 <= 1 else 100.0
     coord_b = 0.0 if n % 2 == 0 else 100.0
     if n < 4:
@@ -352,30 +392,39 @@ def nth_vertex(y, n):
         b = coord_b
         r = (y - g * k_g - b * k_b) / k_r
         if is_bounded(r):
-            return np.array([r, g, b])
+            return [r, g, b]
         else:
-            return np.array([-1.0, -1.0, -1.0])
+            return [-1.0, -1.0, -1.0]
     elif n < 8:
         b = coord_a
         r = coord_b
         g = (y - r * k_r - b * k_b) / k_g
         if is_bounded(g):
-            return np.array([r, g, b])
+            return [r, g, b]
         else:
-            return np.array([-1.0, -1.0, -1.0])
+            return [-1.0, -1.0, -1.0]
     else:
         r = coord_a
         g = coord_b
         b = (y - r * k_r - g * k_g) / k_b
         if is_bounded(b):
-            return np.array([r, g, b])
+            return [r, g, b]
         else:
-            return np.array([-1.0, -1.0, -1.0])
+            return [-1.0, -1.0, -1.0]
 
 
-def bisect_to_segment(y, target_hue):
-    left = np.array([-1.0, -1.0, -1.0])
-    right = left.copy()
+def bisect_to_segment(y, target_hue, viewing_conditions=VIEWING_CONDITIONS_STANDARD):
+    return _bisect_to_segment(y, target_hue, viewing_conditions)[0]
+
+
+def _bisect_to_segment(y, target_hue, viewing_conditions):
+    """
+    Returns the result of [bisect_to_segment] and the number of [hue_of] calls
+    it made.
+    """
+    evaluations = 0
+    left = [-1.0, -1.0, -1.0]
+    right = left
     left_hue = 0.0
     right_hue = 0.0
     initialized = False
@@ -384,10 +433,11 @@ def bisect_to_segment(y, target_hue):
         mid = nth_vertex(y, n)
         if mid[0] < 0:
             continue
-        mid_hue = hue_of(mid)
+        mid_hue = hue_of(mid, viewing_conditions)
+        evaluations += 1
         if not initialized:
-            left = mid.copy()
-            right = mid.copy()
+            left = mid
+            right = mid
             left_hue = mid_hue
             right_hue = mid_hue
             initialized = True
@@ -400,25 +450,34 @@ def bisect_to_segment(y, target_hue):
             else:
                 left = mid
                 left_hue = mid_hue
-    return [left, right]
+    return [left, right], evaluations
 
 
 def midpoint(a, b):
-    return np.array([(a[0] + b[0]) / 2, (a[1] + b[1]) / 2, (a[2] + b[2]) / 2])
+    return [(a[0] + b[0]) / 2, (a[1] + b[1]) / 2, (a[2] + b[2]) / 2]
 
 
 def critical_plane_below(x):
-    return np.floor(x - 0.5)
+    return math.floor(x - 0.5)
 
 
 def critical_plane_above(x):
-    return np.ceil(x - 0.5)
+    return math.ceil(x - 0.5)
+
+
+def bisect_to_limit(y, target_hue, viewing_conditions=VIEWING_CONDITIONS_STANDARD):
+    return _bisect_to_limit(y, target_hue, viewing_conditions)[0]
 
 
-def bisect_to_limit(y, target_hue):
-    segment = bisect_to_segment(y, target_hue)
+def _bisect_to_limit(y, target_hue, viewing_conditions):
+    """
+    Returns the result of [bisect_to_limit] and the number of [hue_of] calls
+    it made, including those of [bisect_to_segment].
+    """
+    segment, evaluations = _bisect_to_segment(y, target_hue, viewing_conditions)
     left = segment[0]
-    left_hue = hue_of(left)
+    left_hue = hue_of(left, viewing_conditions)
+    evaluations += 1
     right = segment[1]
     for axis in range(3):
         if left[axis] != right[axis]:
@@ -431,13 +490,14 @@ def bisect_to_limit(y, target_hue):
                 l_plane = critical_plane_above(true_delinearized(left[axis]))
                 r_plane = critical_plane_below(true_delinearized(right[axis]))
             for i in range(8):
-                if np.abs(r_plane - l_plane) <= 1:
+                if abs(r_plane - l_plane) <= 1:
                     break
                 else:
                     m_plane = int((l_plane + r_plane) / 2.0)
-                    mid_plane_coordinate = CRITICAL_PLANES[m_plane]
+                    mid_plane_coordinate = _CRITICAL_PLANES_LIST[m_plane]
                     mid = set_coordinate(left, mid_plane_coordinate, right, axis)
-                    mid_hue = hue_of(mid)
+                    mid_hue = hue_of(mid, viewing_conditions)
+                    evaluations += 1
                     if are_in_cyclic_order(left_hue, target_hue, mid_hue):
                         right = mid
                         r_plane = m_plane
@@ -445,34 +505,54 @@ def bisect_to_limit(y, target_hue):
                         left = mid
                         left_hue = mid_hue
                         l_plane = m_plane
-    return midpoint(left, right)
+    return midpoint(left, right), evaluations
 
 
 def inverse_chromatic_adaptation(adapted):
+    if isinstance(adapted, float):
+        adapted_abs = abs(adapted)
+        base = max(0.0, 27.13 * adapted_abs / (400.0 - adapted_abs))
+        return _signum(adapted) * (base ** (1.0 / 0.42))
     adapted_abs = np.abs(adapted)
     base = np.maximum(0, 27.13 * adapted_abs / (400.0 - adapted_abs))
     return np.sign(adapted) * (base ** (1.0 / 0.42))
 
 
-def find_result_by_j(hue_radians, chroma, y):
-    j = np.sqrt(y) * 11.0
-    viewing_conditions = VIEWING_CONDITIONS_STANDARD
-    t_inner_coeff = 1 / (
-        (1.64 - np.power(0.29, viewing_conditions.background_y_to_white_point_y))
-        ** 0.73
-    )
-    e_hue = 0.25 * (np.cos(hue_radians + 2.0) + 3.8)
-    p1 = e_hue * (50000.0 / 13.0) * viewing_conditions.nc * viewing_conditions.ncb
-    h_sin = np.sin(hue_radians)
-    h_cos = np.cos(hue_radians)
+def find_result_by_j(
+    hue_radians, chroma, y, viewing_conditions=VIEWING_CONDITIONS_STANDARD
+):
+    p1, h_sin, h_cos = _hue_terms(hue_radians, viewing_conditions)
+    return _newton_by_j(
+        math.sqrt(y) * 11.0, chroma, y, p1, h_sin, h_cos, viewing_conditions
+    )[0]
+
+
+def _hue_terms(hue_radians, viewing_conditions):
+    e_hue = 0.25 * (math.cos(hue_radians + 2.0) + 3.8)
+    p1 = e_hue * viewing_conditions.coefficients.p1_scale
+    return p1, math.sin(hue_radians), math.cos(hue_radians)
+
+
+def _newton_by_j(j, chroma, y, p1, h_sin, h_cos, viewing_conditions):
+    """
+    Runs the Newton iteration of [find_result_by_j] from the starting lightness
+    [j], with the hue-dependent terms already computed.
+
+    Returns the ARGB int (0 if the iteration failed), the last J evaluated and
+    the number of rounds run.
+    """
+    coefficients = viewing_conditions.coefficients
+    t_inner_coeff = coefficients.t_inner_coeff
+    j_exponent = coefficients.inverse_j_exponent
+    aw = viewing_conditions.aw
+    nbb = viewing_conditions.nbb
+    m = coefficients.linrgb_from_scaled_discount
     for iteration_round in range(5):
         j_normalized = j / 100.0
-        alpha = 0.0 if chroma == 0.0 or j == 0.0 else chroma / np.sqrt(j_normalized)
+        alpha = 0.0 if chroma == 0.0 or j == 0.0 else chroma / math.sqrt(j_normalized)
         t = (alpha * t_inner_coeff) ** (1.0 / 0.9)
-        ac = viewing_conditions.aw * (
-            (j_normalized) ** (1.0 / viewing_conditions.c / viewing_conditions.z)
-        )
-        p2 = ac / viewing_conditions.nbb
+        ac = aw * ((j_normalized) ** j_exponent)
+        p2 = ac / nbb
         gamma = (
             23.0 * (p2 + 0.305) * t / (23.0 * p1 + 11 * t * h_cos + 108.0 * t * h_sin)
         )
@@ -484,40 +564,463 @@ def find_result_by_j(hue_radians, chroma, y):
         r_c_scaled = inverse_chromatic_adaptation(r_a)
         g_c_scaled = inverse_chromatic_adaptation(g_a)
         b_c_scaled = inverse_chromatic_adaptation(b_a)
-        linrgb = (
-            np.array([r_c_scaled, g_c_scaled, b_c_scaled])
-            @ LINRGB_FROM_SCALED_DISCOUNT.T
-        )
+        linrgb = [
+            m[0][0] * r_c_scaled + m[0][1] * g_c_scaled + m[0][2] * b_c_scaled,
+            m[1][0] * r_c_scaled + m[1][1] * g_c_scaled + m[1][2] * b_c_scaled,
+            m[2][0] * r_c_scaled + m[2][1] * g_c_scaled + m[2][2] * b_c_scaled,
+        ]
         if linrgb[0] < 0 or linrgb[1] < 0 or linrgb[2] < 0:
-            return 0
-        k_r = Y_FROM_LINRGB[0]
-        k_g = Y_FROM_LINRGB[1]
-        k_b = Y_FROM_LINRGB[2]
-        fnj = k_r * linrgb[0] + k_g * linrgb[1] + k_b * linrgb[2]
+            return 0, j, iteration_round + 1
+        fnj = _K_R * linrgb[0] + _K_G * linrgb[1] + _K_B * linrgb[2]
         if fnj <= 0:
-            return 0
-        if iteration_round == 4 or np.abs(fnj - y) < 0.002:
+            return 0, j, iteration_round + 1
+        if iteration_round == 4 or abs(fnj - y) < 0.002:
             if linrgb[0] > 100.01 or linrgb[1] > 100.01 or linrgb[2] > 100.01:
-                return 0
-            return argb_from_linrgb(linrgb)
+                return 0, j, iteration_round + 1
+            return argb_from_linrgb(linrgb), j, iteration_round + 1
         # Iterates with Newton method,
         # Using 2 * fn(j) / j as the approximation of fn'(j)
         j = j - (fnj - y) * j / (2 * fnj)
-    return 0
+    return 0, j, 5
+
+
+def _signum(x):
+    if x > 0:
+        return 1.0
+    if x < 0:
+        return -1.0
+    return 0.0
+
+
+def _check_clamp_chroma(clamp_chroma, viewing_conditions):
+    if clamp_chroma and viewing_conditions is not VIEWING_CONDITIONS_STANDARD:
+        raise ValueError(
+            "clamp_chroma is only available for the standard viewing conditions"
+        )
+
+
+def solve_to_int(
+    hue_degrees,
+    chroma,
+    lstar,
+    clamp_chroma=False,
+    viewing_conditions=VIEWING_CONDITIONS_STANDARD,
+):
+    """
+    Finds the sRGB color with the given [hue_degrees], [chroma] and [lstar], or
+    the closest in-gamut color with the same hue and tone when [chroma] is out
+    of reach.
 
+    Hue and chroma are interpreted in [viewing_conditions]. With
+    [clamp_chroma], [chroma] is first limited to the maximum chroma that
+    [gamut.max_chroma] reports for the hue and tone.
 
-def solve_to_int(hue_degrees, chroma, lstar):
+    Single colors go through the shared [solve_memo] unless it is disabled,
+    and solves that miss it are reported to [solver_stats] when enabled.
+    """
+    if (
+        isinstance(hue_degrees, np.ndarray)
+        or isinstance(chroma, np.ndarray)
+        or isinstance(lstar, np.ndarray)
+    ):
+        return solve_to_int_array(
+            hue_degrees, chroma, lstar, clamp_chroma, viewing_conditions
+        )
+    memo = solve_memo.memo
+    if memo is not None:
+        return memo.solve(
+            _solve_to_int, hue_degrees, chroma, lstar, clamp_chroma, viewing_conditions
+        )
+    return _solve_to_int(hue_degrees, chroma, lstar, clamp_chroma, viewing_conditions)
+
+
+def _solve_to_int(hue_degrees, chroma, lstar, clamp_chroma, viewing_conditions):
+    _check_clamp_chroma(clamp_chroma, viewing_conditions)
+    if clamp_chroma:
+        chroma = float(gamut.clamp_chroma(hue_degrees, chroma, lstar))
+    recorder = solver_stats.recorder
+    if recorder is not None:
+        return _solve_to_int_recorded(
+            recorder, hue_degrees, chroma, lstar, viewing_conditions
+        )
     if chroma < 0.0001 or lstar < 0.0001 or lstar > 99.9999:
         return argb_from_lstar(lstar)
     hue_degrees = sanitize_degrees(hue_degrees)
-    hue_radians = hue_degrees / 180 * np.pi
+    hue_radians = hue_degrees / 180 * math.pi
     y = y_from_lstar(lstar)
-    exact_answer = find_result_by_j(hue_radians, chroma, y)
-    if exact_answer != 0:
-        return exact_answer
-    linrgb = bisect_to_limit(y, hue_radians)
+    # Requests the gamut table rules out would only be rejected by the Newton
+    # iteration, so they go straight to the boundary search. The table is only
+    # built for the standard viewing conditions.
+    if viewing_conditions is not VIEWING_CONDITIONS_STANDARD or not (
+        gamut.is_out_of_gamut(hue_degrees, chroma, lstar)
+    ):
+        exact_answer = find_result_by_j(hue_radians, chroma, y, viewing_conditions)
+        if exact_answer != 0:
+            return exact_answer
+    linrgb = bisect_to_limit(y, hue_radians, viewing_conditions)
     return argb_from_linrgb(linrgb)
 
 
-def solve_to_cam(hue_degrees, chroma, lstar):
-    return Cam16.from_int(solve_to_int(hue_degrees, chroma, lstar))
+def _solve_to_int_recorded(recorder, hue_degrees, chroma, lstar, viewing_conditions):
+    """
+    [_solve_to_int] after chroma clamping, timing each phase and reporting the
+    solve to [recorder].
+    """
+    if chroma < 0.0001 or lstar < 0.0001 or lstar > 99.9999:
+        recorder.record(achromatic=True)
+        return argb_from_lstar(lstar)
+    hue_degrees = sanitize_degrees(hue_degrees)
+    hue_radians = hue_degrees / 180 * math.pi
+    y = y_from_lstar(lstar)
+    start = time.perf_counter()
+    gamut_rejected = viewing_conditions is VIEWING_CONDITIONS_STANDARD and (
+        gamut.is_out_of_gamut(hue_degrees, chroma, lstar)
+    )
+    newton_start = time.perf_counter()
+    rounds = 0
+    if not gamut_rejected:
+        p1, h_sin, h_cos = _hue_terms(hue_radians, viewing_conditions)
+        exact_answer, _, rounds = _newton_by_j(
+            math.sqrt(y) * 11.0, chroma, y, p1, h_sin, h_cos, viewing_conditions
+        )
+        if exact_answer != 0:
+            recorder.record(
+                newton_rounds=rounds,
+                converged=True,
+                gamut_seconds=newton_start - start,
+                newton_seconds=time.perf_counter() - newton_start,
+            )
+            return exact_answer
+    bisection_start = time.perf_counter()
+    linrgb, evaluations = _bisect_to_limit(y, hue_radians, viewing_conditions)
+    argb = argb_from_linrgb(linrgb)
+    recorder.record(
+        gamut_rejected=gamut_rejected,
+        newton_rounds=rounds,
+        hue_evaluations=evaluations,
+        gamut_seconds=newton_start - start,
+        newton_seconds=bisection_start - newton_start,
+        bisection_seconds=time.perf_counter() - bisection_start,
+    )
+    return argb
+
+
+def solve_tone_sweep(
+    hue_degrees,
+    chroma,
+    tones,
+    viewing_conditions=VIEWING_CONDITIONS_STANDARD,
+    warm_start=False,
+    stats=None,
+):
+    """
+    Solves [hue_degrees] and [chroma] at each of [tones], returning a list of
+    ARGB ints equal to calling [solve_to_int] once per tone.
+
+    The hue-dependent terms of the Newton iteration are computed once for the
+    whole sweep. With [warm_start], each tone's iteration starts from the J
+    the previous tone converged to, scaled by the change in tone, instead of
+    from its own cold guess. That takes about a third fewer rounds, but the
+    iteration then stops at a different point inside its tolerance, so around
+    1% of colors can differ from [solve_to_int] by a rounding step.
+
+    If [stats] is a dict, the number of Newton rounds run is added to its
+    "newton_rounds" entry.
+    """
+    results = []
+    if chroma < 0.0001:
+        return [argb_from_lstar(lstar) for lstar in tones]
+    hue_degrees = sanitize_degrees(hue_degrees)
+    hue_radians = hue_degrees / 180 * math.pi
+    p1, h_sin, h_cos = _hue_terms(hue_radians, viewing_conditions)
+    standard = viewing_conditions is VIEWING_CONDITIONS_STANDARD
+    rounds = 0
+    previous_j = None
+    previous_y = None
+    for lstar in tones:
+        if lstar < 0.0001 or lstar > 99.9999:
+            results.append(argb_from_lstar(lstar))
+            continue
+        y = y_from_lstar(lstar)
+        if not standard or not gamut.is_out_of_gamut(hue_degrees, chroma, lstar):
+            if warm_start and previous_j is not None:
+                j = previous_j * math.sqrt(y / previous_y)
+            else:
+                j = math.sqrt(y) * 11.0
+            exact_answer, j, iterations = _newton_by_j(
+                j, chroma, y, p1, h_sin, h_cos, viewing_conditions
+            )
+            rounds += iterations
+            if exact_answer != 0:
+                previous_j = j
+                previous_y = y
+                results.append(exact_answer)
+                continue
+        linrgb = bisect_to_limit(y, hue_radians, viewing_conditions)
+        results.append(argb_from_linrgb(linrgb))
+    if stats is not None:
+        stats["newton_rounds"] = stats.get("newton_rounds", 0) + rounds
+    return results
+
+
+def solve_to_cam(
+    hue_degrees, chroma, lstar, viewing_conditions=VIEWING_CONDITIONS_STANDARD
+):
+    return Cam16.from_int_in_viewing_conditions(
+        solve_to_int(hue_degrees, chroma, lstar, False, viewing_conditions),
+        viewing_conditions,
+    )
+
+
+def _hue_of_array(linrgb, viewing_conditions):
+    coefficients = viewing_conditions.coefficients
+    scaled_discount = linrgb @ coefficients.scaled_discount_from_linrgb_array.T
+    r_a = chromatic_adaptation(scaled_discount[..., 0])
+    g_a = chromatic_adaptation(scaled_discount[..., 1])
+    b_a = chromatic_adaptation(scaled_discount[..., 2])
+    a = (11.0 * r_a - 12.0 * g_a + b_a) / 11.0
+    b = (r_a + g_a - 2.0 * b_a) / 9.0
+    return np.arctan2(b, a)
+
+
+def _true_delinearized_array(rgb_component):
+    normalized = rgb_component / 100.0
+    delinearized = np.where(
+        normalized <= 0.0031308,
+        normalized * 12.92,
+        1.055 * (np.abs(normalized) ** (1.0 / 2.4)) - 0.055,
+    )
+    return delinearized * 255.0
+
+
+def _nth_vertex_array(y, n):
+    k_r = Y_FROM_LINRGB[0]
+    k_g = Y_FROM_LINRGB[1]
+    k_b = Y_FROM_LINRGB[2]
+    coord_a = 0.0 if n % 4 <= 1 else 100.0
+    coord_b = 0.0 if n % 2 == 0 else 100.0
+    vertex = np.empty((y.shape[0], 3))
+    if n < 4:
+        vertex[:, 1] = coord_a
+        vertex[:, 2] = coord_b
+        vertex[:, 0] = (y - coord_a * k_g - coord_b * k_b) / k_r
+        axis = 0
+    elif n < 8:
+        vertex[:, 2] = coord_a
+        vertex[:, 0] = coord_b
+        vertex[:, 1] = (y - coord_b * k_r - coord_a * k_b) / k_g
+        axis = 1
+    else:
+        vertex[:, 0] = coord_a
+        vertex[:, 1] = coord_b
+        vertex[:, 2] = (y - coord_a * k_r - coord_b * k_g) / k_b
+        axis = 2
+    valid = (vertex[:, axis] >= 0.0) & (vertex[:, axis] <= 100.0)
+    vertex[~valid] = -1.0
+    return vertex, valid
+
+
+def _bisect_to_segment_array(y, target_hue, viewing_conditions):
+    count = y.shape[0]
+    left = np.full((count, 3), -1.0)
+    right = left.copy()
+    left_hue = np.zeros(count)
+    right_hue = np.zeros(count)
+    initialized = np.zeros(count, dtype=bool)
+    uncut = np.ones(count, dtype=bool)
+    for n in range(12):
+        mid, valid = _nth_vertex_array(y, n)
+        mid_hue = _hue_of_array(mid, viewing_conditions)
+
+        first = valid & ~initialized
+        left[first] = mid[first]
+        right[first] = mid[first]
+        left_hue[first] = mid_hue[first]
+        right_hue[first] = mid_hue[first]
+        initialized |= first
+
+        cut = (valid & ~first) & (
+            uncut | are_in_cyclic_order(left_hue, mid_hue, right_hue)
+        )
+        uncut &= ~cut
+        to_right = cut & are_in_cyclic_order(left_hue, target_hue, mid_hue)
+        to_left = cut & ~to_right
+        right[to_right] = mid[to_right]
+        right_hue[to_right] = mid_hue[to_right]
+        left[to_left] = mid[to_left]
+        left_hue[to_left] = mid_hue[to_left]
+    return left, right
+
+
+def _bisect_to_limit_array(y, target_hue, viewing_conditions):
+    left, right = _bisect_to_segment_array(y, target_hue, viewing_conditions)
+    left_hue = _hue_of_array(left, viewing_conditions)
+    for axis in range(3):
+        differs = left[:, axis] != right[:, axis]
+        ascending = left[:, axis] < right[:, axis]
+        left_delinearized = _true_delinearized_array(left[:, axis])
+        right_delinearized = _true_delinearized_array(right[:, axis])
+        l_plane = np.where(
+            ascending,
+            np.floor(left_delinearized - 0.5),
+            np.ceil(left_delinearized - 0.5),
+        )
+        r_plane = np.where(
+            ascending,
+            np.ceil(right_delinearized - 0.5),
+            np.floor(right_delinearized - 0.5),
+        )
+        for i in range(8):
+            active = np.flatnonzero(differs & (np.abs(r_plane - l_plane) > 1))
+            if active.size == 0:
+                break
+            m_plane = np.trunc((l_plane[active] + r_plane[active]) / 2.0)
+            mid_plane_coordinate = _critical_planes_array()[m_plane.astype(np.intp)]
+            source = left[active]
+            target = right[active]
+            t = intercept(source[:, axis], mid_plane_coordinate, target[:, axis])
+            mid = source + (target - source) * t[:, None]
+            mid_hue = _hue_of_array(mid, viewing_conditions)
+            to_right = are_in_cyclic_order(
+                left_hue[active], target_hue[active], mid_hue
+            )
+            right_indices = active[to_right]
+            right[right_indices] = mid[to_right]
+            r_plane[right_indices] = m_plane[to_right]
+            left_indices = active[~to_right]
+            left[left_indices] = mid[~to_right]
+            left_hue[left_indices] = mid_hue[~to_right]
+            l_plane[left_indices] = m_plane[~to_right]
+    return (left + right) / 2
+
+
+def _find_result_by_j_array(hue_radians, chroma, y, viewing_conditions):
+    """
+    Vectorized [find_result_by_j].
+
+    Returns ARGB for elements whose Newton iteration converged inside the sRGB
+    gamut and 0 for the rest.
+    """
+    result = np.zeros(y.shape[0], dtype=np.uint32)
+    j = np.sqrt(y) * 11.0
+    coefficients = viewing_conditions.coefficients
+    t_inner_coeff = coefficients.t_inner_coeff
+    e_hue = 0.25 * (np.cos(hue_radians + 2.0) + 3.8)
+    p1 = e_hue * coefficients.p1_scale
+    h_sin = np.sin(hue_radians)
+    h_cos = np.cos(hue_radians)
+    # Indices of elements still iterating; converged or rejected elements drop
+    # out of every array below.
+    active = np.arange(y.shape[0])
+    for iteration_round in range(5):
+        j_normalized = j / 100.0
+        alpha = np.where(
+            (chroma == 0.0) | (j == 0.0), 0.0, chroma / np.sqrt(j_normalized)
+        )
+        t = (alpha * t_inner_coeff) ** (1.0 / 0.9)
+        ac = viewing_conditions.aw * ((j_normalized) ** coefficients.inverse_j_exponent)
+        p2 = ac / viewing_conditions.nbb
+        gamma = (
+            23.0 * (p2 + 0.305) * t / (23.0 * p1 + 11 * t * h_cos + 108.0 * t * h_sin)
+        )
+        a = gamma * h_cos
+        b = gamma * h_sin
+        r_a = (460.0 * p2 + 451.0 * a + 288.0 * b) / 1403.0
+        g_a = (460.0 * p2 - 891.0 * a - 261.0 * b) / 1403.0
+        b_a = (460.0 * p2 - 220.0 * a - 6300.0 * b) / 1403.0
+        linrgb = (
+            np.stack(
+                [
+                    inverse_chromatic_adaptation(r_a),
+                    inverse_chromatic_adaptation(g_a),
+                    inverse_chromatic_adaptation(b_a),
+                ],
+                axis=-1,
+            )
+            @ coefficients.linrgb_from_scaled_discount_array.T
+        )
+        k_r = Y_FROM_LINRGB[0]
+        k_g = Y_FROM_LINRGB[1]
+        k_b = Y_FROM_LINRGB[2]
+        fnj = k_r * linrgb[:, 0] + k_g * linrgb[:, 1] + k_b * linrgb[:, 2]
+        rejected = np.any(linrgb < 0, axis=-1) | (fnj <= 0)
+        if iteration_round == 4:
+            done = ~rejected
+        else:
+            done = ~rejected & (np.abs(fnj - y) < 0.002)
+        accepted = done & ~np.any(linrgb > 100.01, axis=-1)
+        result[active[accepted]] = argb_from_linrgb_array(linrgb[accepted])
+
+        remaining = ~(rejected | done)
+        if not remaining.any():
+            break
+        active = active[remaining]
+        fnj = fnj[remaining]
+        y = y[remaining]
+        j = j[remaining]
+        # Iterates with Newton method,
+        # Using 2 * fn(j) / j as the approximation of fn'(j)
+        j = j - (fnj - y) * j / (2 * fnj)
+        chroma = chroma[remaining]
+        p1 = p1[remaining]
+        h_sin = h_sin[remaining]
+        h_cos = h_cos[remaining]
+    return result
+
+
+def solve_to_int_array(
+    hue_degrees,
+    chroma,
+    lstar,
+    clamp_chroma=False,
+    viewing_conditions=VIEWING_CONDITIONS_STANDARD,
+):
+    """
+    Vectorized [solve_to_int] over equal-length arrays of HCT components.
+
+    Newton iteration runs on the whole batch; only the elements that fail to
+    converge inside the gamut are sent to the bisection fallback. Returns a
+    uint32 array of ARGB ints matching the scalar solver.
+    """
+    hue_degrees, chroma, lstar = np.broadcast_arrays(
+        np.asarray(hue_degrees, dtype=np.float64),
+        np.asarray(chroma, dtype=np.float64),
+        np.asarray(lstar, dtype=np.float64),
+    )
+    shape = lstar.shape
+    hue_degrees = hue_degrees.ravel()
+    chroma = chroma.ravel()
+    lstar = lstar.ravel()
+    _check_clamp_chroma(clamp_chroma, viewing_conditions)
+    if clamp_chroma:
+        chroma = gamut.clamp_chroma(hue_degrees, chroma, lstar)
+
+    result = np.empty(lstar.shape[0], dtype=np.uint32)
+    achromatic = (chroma < 0.0001) | (lstar < 0.0001) | (lstar > 99.9999)
+    result[achromatic] = argb_from_lstar_array(lstar[achromatic])
+
+    chromatic = np.flatnonzero(~achromatic)
+    hue_degrees = np.mod(hue_degrees[chromatic], 360.0)
+    hue_radians = hue_degrees / 180 * np.pi
+    y = y_from_lstar(lstar[chromatic])
+    exact_answer = np.zeros(chromatic.shape[0], dtype=np.uint32)
+    if viewing_conditions is VIEWING_CONDITIONS_STANDARD:
+        reachable = np.flatnonzero(
+            ~gamut.is_out_of_gamut_array(
+                hue_degrees, chroma[chromatic], lstar[chromatic]
+            )
+        )
+    else:
+        reachable = np.arange(chromatic.shape[0])
+    exact_answer[reachable] = _find_result_by_j_array(
+        hue_radians[reachable],
+        chroma[chromatic[reachable]],
+        y[reachable],
+        viewing_conditions,
+    )
+    result[chromatic] = exact_answer
+
+    missed = exact_answer == 0
+    linrgb = _bisect_to_limit_array(y[missed], hue_radians[missed], viewing_conditions)
+    result[chromatic[missed]] = argb_from_linrgb_array(linrgb)
+    return result.reshape(shape)
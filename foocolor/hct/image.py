@@ -0,0 +1,88 @@
+"""
+Whole-image edits in HCT: each distinct color of an image is converted,
+adjusted and solved back once, in bulk, and the results are scattered back to
+its pixels.
+
+    from foocolor.hct.image import transform_image
+
+    # A dark-mode variant: mirror every tone.
+    dark = transform_image(rgba, lambda hue, chroma, tone: (hue, chroma, 100 - tone))
+"""
+
+import numpy as np
+
+from ..util.color_util import argb_from_rgba_buffer, rgba_buffer_from_argb
+from .hct_array import HctArray
+
+_RGB_MASK = np.uint32(0x00FFFFFF)
+_ALPHA_MASK = np.uint32(0xFF000000)
+
+
+def transform_image(pixels, transform, channel_order="rgba", viewing_conditions=None):
+    """
+    Returns a copy of the packed 8-bit RGBA or BGRA image [pixels] with
+    [transform] applied to the hue, chroma and tone of every pixel.
+
+    [pixels] is anything [argb_from_rgba_buffer] reads, or a uint8 array that
+    need not be contiguous, such as a crop. [transform] is called once with
+    float64 arrays of the hue, chroma and tone of the image's unique colors, in
+    [viewing_conditions], and returns the new hue, chroma and tone (arrays or
+    scalars). Only the colors it changes are solved again. Alpha is kept as is
+    and doesn't affect the transform.
+
+    The result is a new uint8 array with the shape of [pixels] if it is an
+    array, and one byte per channel otherwise.
+    """
+    if isinstance(pixels, np.ndarray):
+        if pixels.dtype != np.uint8:
+            raise TypeError(f"pixels must be a uint8 array, got {pixels.dtype}")
+        # Slices and crops are copied into the packed layout the buffer needs.
+        pixels = np.ascontiguousarray(pixels)
+        shape = pixels.shape
+    else:
+        shape = (-1,)
+    argb = argb_from_rgba_buffer(pixels, channel_order)
+    unique, inverse = np.unique(argb & _RGB_MASK, return_inverse=True)
+    colors = HctArray(unique | _ALPHA_MASK, viewing_conditions)
+    transformed = colors.with_hct(*transform(colors.hue, colors.chroma, colors.tone))
+    result = (transformed.argb[inverse.reshape(-1)] & _RGB_MASK) | (argb & _ALPHA_MASK)
+    return rgba_buffer_from_argb(result, channel_order).reshape(shape)
+
+
+def with_tone(pixels, tone, channel_order="rgba", viewing_conditions=None):
+    """
+    [transform_image] that maps each pixel's tone through the vectorized
+    function [tone].
+    """
+    return transform_image(
+        pixels,
+        lambda h, c, t: (h, c, tone(t)),
+        channel_order,
+        viewing_conditions,
+    )
+
+
+def with_chroma(pixels, chroma, channel_order="rgba", viewing_conditions=None):
+    """
+    [transform_image] that maps each pixel's chroma through the vectorized
+    function [chroma].
+    """
+    return transform_image(
+        pixels,
+        lambda h, c, t: (h, chroma(c), t),
+        channel_order,
+        viewing_conditions,
+    )
+
+
+def with_hue(pixels, hue, channel_order="rgba", viewing_conditions=None):
+    """
+    [transform_image] that maps each pixel's hue through the vectorized
+    function [hue].
+    """
+    return transform_image(
+        pixels,
+        lambda h, c, t: (hue(h), c, t),
+        channel_order,
+        viewing_conditions,
+    )
@@ -0,0 +1,113 @@
+"""
+A process-wide memo in front of [hct_solver.solve_to_int].
+
+Palettes, schemes and scoring solve the same (hue, chroma, tone) requests over
+and over, from independent objects. The memo keeps the most recently used
+results, shared by every caller and safe to use from several threads.
+
+Keys are the exact request by default. With a quantization step, each
+component is rounded to a multiple of the step and the solver is run on the
+rounded request, so a cached result is always the exact answer for its key.
+
+    from foocolor.hct import solve_memo
+
+    solve_memo.configure(max_size=16384, quantization=0.01)
+    solve_memo.stats()  # {"hits": ..., "misses": ..., ...}
+    solve_memo.disable()
+"""
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_SIZE = 4096
+
+
+class SolveMemo:
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, quantization=None):
+        if max_size < 1:
+            raise ValueError(f"max_size must be positive, got {max_size}")
+        if quantization is not None and quantization <= 0:
+            raise ValueError(f"quantization must be positive, got {quantization}")
+        self.max_size = max_size
+        self.quantization = quantization
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def solve(self, solver, hue, chroma, tone, clamp_chroma, viewing_conditions):
+        """
+        Returns [solver]'s result for the request, from the memo if present.
+        """
+        step = self.quantization
+        if step is not None:
+            hue = round(hue / step) * step
+            chroma = round(chroma / step) * step
+            tone = round(tone / step) * step
+        key = (hue, chroma, tone, clamp_chroma, viewing_conditions)
+        with self._lock:
+            argb = self._entries.get(key)
+            if argb is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return argb
+            self._misses += 1
+        # Solved outside the lock; two threads missing on the same key at once
+        # both solve it and store the same result.
+        argb = solver(hue, chroma, tone, clamp_chroma, viewing_conditions)
+        with self._lock:
+            self._entries[key] = argb
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return argb
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "quantization": self.quantization,
+            }
+
+
+# The memo [hct_solver.solve_to_int] consults, or None when disabled.
+memo = SolveMemo()
+
+
+def configure(max_size: int = DEFAULT_MAX_SIZE, quantization=None):
+    """
+    Replaces the memo with an empty one holding up to [max_size] results, with
+    keys rounded to multiples of [quantization] if given.
+    """
+    global memo
+    memo = SolveMemo(max_size, quantization)
+
+
+def disable():
+    """
+    Turns the memo off; [configure] turns it back on.
+    """
+    global memo
+    memo = None
+
+
+def clear():
+    if memo is not None:
+        memo.clear()
+
+
+def stats():
+    """
+    Returns the memo's hit, miss and eviction counts, its size and settings,
+    or None when it is disabled.
+    """
+    return None if memo is None else memo.stats()
@@ -0,0 +1,137 @@
+"""
+Opt-in counters and timings for [hct_solver.solve_to_int].
+
+While disabled (the default) the solver only checks that [recorder] is None.
+Once enabled, every single-color solve that reaches the solver, so not memo
+hits, array solves or tone sweeps, reports what it did: whether the gamut table
+rejected it, how many Newton rounds ran and whether they converged, and how
+many hue evaluations the bisection fallback needed.
+
+    from foocolor.hct import solver_stats
+
+    solver_stats.enable()
+    ...
+    solver_stats.snapshot()  # {"solves": ..., "bisections": ..., ...}
+
+A callback passed to [enable] is called with a dict describing each solve, for
+exporting to a metrics system.
+"""
+
+import threading
+
+COUNTERS = (
+    "solves",
+    "achromatic",
+    "gamut_rejections",
+    "newton_solves",
+    "newton_rounds",
+    "early_exits",
+    "newton_failures",
+    "bisections",
+    "hue_evaluations",
+)
+TIMERS = ("gamut_seconds", "newton_seconds", "bisection_seconds")
+
+
+class SolverStats:
+    """
+    Aggregates solve records from any number of threads.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._totals = dict.fromkeys(COUNTERS, 0)
+        self._totals.update(dict.fromkeys(TIMERS, 0.0))
+
+    def record(
+        self,
+        achromatic=False,
+        gamut_rejected=False,
+        newton_rounds=0,
+        converged=False,
+        hue_evaluations=0,
+        gamut_seconds=0.0,
+        newton_seconds=0.0,
+        bisection_seconds=0.0,
+    ):
+        """
+        Adds one solve to the totals.
+
+        [newton_rounds] is 0 when the Newton iteration was skipped, and a
+        nonzero [hue_evaluations] means the bisection fallback ran.
+        """
+        newton_ran = newton_rounds > 0
+        bisected = hue_evaluations > 0
+        with self._lock:
+            totals = self._totals
+            totals["solves"] += 1
+            totals["achromatic"] += achromatic
+            totals["gamut_rejections"] += gamut_rejected
+            totals["newton_solves"] += newton_ran
+            totals["newton_rounds"] += newton_rounds
+            totals["early_exits"] += converged and newton_rounds < 5
+            totals["newton_failures"] += newton_ran and not converged
+            totals["bisections"] += bisected
+            totals["hue_evaluations"] += hue_evaluations
+            totals["gamut_seconds"] += gamut_seconds
+            totals["newton_seconds"] += newton_seconds
+            totals["bisection_seconds"] += bisection_seconds
+        if self.callback is not None:
+            self.callback(
+                {
+                    "achromatic": achromatic,
+                    "gamut_rejected": gamut_rejected,
+                    "newton_rounds": newton_rounds,
+                    "converged": converged,
+                    "bisected": bisected,
+                    "hue_evaluations": hue_evaluations,
+                    "gamut_seconds": gamut_seconds,
+                    "newton_seconds": newton_seconds,
+                    "bisection_seconds": bisection_seconds,
+                }
+            )
+
+    def reset(self):
+        with self._lock:
+            for key in self._totals:
+                self._totals[key] = type(self._totals[key])()
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._totals)
+
+
+# The stats [hct_solver.solve_to_int] reports to, or None when disabled.
+recorder = None
+
+
+def enable(callback=None):
+    """
+    Starts recording into fresh totals, calling [callback] with each solve's
+    record if given.
+    """
+    global recorder
+    recorder = SolverStats(callback)
+
+
+def disable():
+    global recorder
+    recorder = None
+
+
+def reset():
+    if recorder is not None:
+        recorder.reset()
+
+
+def snapshot():
+    """
+    Returns the totals recorded since [enable] or [reset], or None when
+    disabled.
+
+    "early_exits" counts Newton iterations that met the tolerance before their
+    last round, "newton_failures" those that fell back to bisection, and
+    "hue_evaluations" the hue_of calls the fallbacks made.
+    """
+    return None if recorder is None else recorder.snapshot()
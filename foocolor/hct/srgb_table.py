@@ -0,0 +1,172 @@
+"""
+Precomputed HCT and L*a*b* coordinates for every 24-bit sRGB color.
+
+The table is a single file holding a small header followed by one float32 row
+per color, indexed by the color's RGB bits:
+
+    hue, chroma, tone, a, b
+
+Tone is L*, so the L*a*b* lightness is the tone column. The file is memory
+mapped read-only, which lets every process on a machine share one copy and
+turns a conversion into a gather.
+
+Build it once with:
+
+    python -m foocolor.hct.srgb_table build PATH
+
+and point FOOCOLOR_SRGB_TABLE at PATH, or call [use] with it. Without a table
+the conversions below fall back to computing the values.
+"""
+
+import os
+import struct
+
+import numpy as np
+
+from ..util import color_util
+from .cam16 import Cam16
+
+MAGIC = b"FOOCOLOR"
+FORMAT_VERSION = 1
+FIELDS = ("hue", "chroma", "tone", "a", "b")
+COLOR_COUNT = 1 << 24
+
+# Magic, format version, field count and color count, padded to 32 bytes so
+# the rows that follow stay aligned.
+_HEADER = struct.Struct("<8sIII12x")
+
+_table = None
+_table_checked = False
+
+
+class SrgbTable:
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError(f"{path} is not an sRGB table")
+        magic, version, field_count, color_count = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an sRGB table")
+        if version != FORMAT_VERSION:
+            raise ValueError(
+                f"{path} has table format {version}, expected {FORMAT_VERSION}"
+            )
+        if field_count != len(FIELDS) or color_count != COLOR_COUNT:
+            raise ValueError(f"{path} has an unexpected table shape")
+        self.path = path
+        self._rows = np.memmap(
+            path,
+            dtype=np.float32,
+            mode="r",
+            offset=_HEADER.size,
+            shape=(COLOR_COUNT, len(FIELDS)),
+        )
+
+    def hct(self, argb):
+        """
+        Returns the hue, chroma and tone of [argb] as float32 arrays.
+        """
+        rows = self._rows[np.asarray(argb, dtype=np.uint32) & 0xFFFFFF]
+        return rows[..., 0], rows[..., 1], rows[..., 2]
+
+    def lab(self, argb):
+        """
+        Returns the L*a*b* coordinates of [argb] as a float32 (..., 3) array.
+        """
+        return self._rows[np.asarray(argb, dtype=np.uint32) & 0xFFFFFF][..., 2:]
+
+
+def _compute(argb):
+    argb = np.asarray(argb, dtype=np.uint32)
+    cam = Cam16.from_int_array(argb)
+    lab = color_util.lab_from_argb_array(argb)
+    return cam.hue, cam.chroma, lab
+
+
+def build(path: str, chunk_size: int = 1 << 20) -> None:
+    """
+    Computes the table for every 24-bit color and writes it to [path].
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(FIELDS), COLOR_COUNT))
+        for start in range(0, COLOR_COUNT, chunk_size):
+            argb = np.arange(
+                start, min(start + chunk_size, COLOR_COUNT), dtype=np.uint32
+            )
+            hue, chroma, lab = _compute(argb | 0xFF000000)
+            rows = np.empty((argb.shape[0], len(FIELDS)), dtype=np.float32)
+            rows[:, 0] = hue
+            rows[:, 1] = chroma
+            rows[:, 2:] = lab
+            rows.tofile(f)
+    os.replace(tmp_path, path)
+
+
+def use(path):
+    """
+    Memory-maps the table at [path] for the conversions below, or stops using a
+    table if [path] is None.
+    """
+    global _table, _table_checked
+    _table = None if path is None else SrgbTable(path)
+    _table_checked = True
+
+
+def get_table():
+    """
+    Returns the table in use, loading FOOCOLOR_SRGB_TABLE on first call, or
+    None if no table is available.
+    """
+    global _table, _table_checked
+    if not _table_checked:
+        _table_checked = True
+        path = os.environ.get("FOOCOLOR_SRGB_TABLE")
+        if path is not None and os.path.exists(path):
+            _table = SrgbTable(path)
+    return _table
+
+
+def hct_from_argb_array(argb):
+    """
+    Returns the hue, chroma and tone of an array of ARGB ints.
+
+    Values come from the table when one is in use (as float32), and are
+    computed otherwise.
+    """
+    table = get_table()
+    if table is not None:
+        return table.hct(argb)
+    hue, chroma, lab = _compute(argb)
+    return hue, chroma, lab[..., 0]
+
+
+def lab_from_argb_array(argb):
+    """
+    Returns the L*a*b* coordinates of an array of ARGB ints as a (..., 3) array.
+
+    Values come from the table when one is in use (as float32), and are
+    computed otherwise.
+    """
+    table = get_table()
+    if table is not None:
+        return table.lab(argb)
+    return color_util.lab_from_argb_array(np.asarray(argb, dtype=np.uint32))
+
+
+def main(argv=None):
+    # Imported here; argparse is slow to import and only the CLI needs it.
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m foocolor.hct.srgb_table")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="write the table to a file")
+    build_parser.add_argument("path")
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        build(args.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import numpy as np
+
+from .cam16 import Cam16
+from .viewing_conditions import VIEWING_CONDITIONS_SRGB
+
+# Upper bound on the number of pairs held in one block of a distance
+# computation; each block needs a few float64 temporaries of this size.
+_BLOCK_PAIRS = 1 << 20
+
+
+def ucs_from_argb_array(argb, viewing_conditions=VIEWING_CONDITIONS_SRGB):
+    """
+    Returns the CAM16-UCS coordinates (jstar, astar, bstar) of an array of ARGB
+    ints as a (..., 3) array.
+    """
+    cam = Cam16.from_int_array_in_viewing_conditions(
+        np.asarray(argb, dtype=np.uint32), viewing_conditions
+    )
+    return np.stack([cam.jstar, cam.astar, cam.bstar], axis=-1)
+
+
+def _ucs_rows(colors):
+    colors = np.asarray(colors, dtype=np.float64)
+    if colors.ndim != 2 or colors.shape[1] != 3:
+        raise ValueError("expected an (n, 3) array of UCS coordinates")
+    return colors
+
+
+def _block_rows(other_count, block_size):
+    if block_size is not None:
+        return max(1, block_size)
+    return max(1, _BLOCK_PAIRS // max(1, other_count))
+
+
+def _squared_distances(block, other):
+    # One component at a time, so temporaries stay (rows, other) rather than
+    # (rows, other, 3).
+    squared = np.subtract.outer(block[:, 0], other[:, 0])
+    np.square(squared, out=squared)
+    for axis in (1, 2):
+        delta = np.subtract.outer(block[:, axis], other[:, axis])
+        np.square(delta, out=delta)
+        squared += delta
+    return squared
+
+
+def _delta_e(squared):
+    # Same as [Cam16.distance]: 1.41 * (delta E')^0.63, with
+    # (delta E')^2 = squared.
+    return 1.41 * np.power(squared, 0.63 / 2.0)
+
+
+def distance_matrix(colors, others=None, block_size=None):
+    """
+    Returns the [Cam16.distance] between every row of [colors] and every row of
+    [others] (or [colors] itself), both (n, 3) arrays of CAM16-UCS coordinates,
+    as an (n, m) array.
+
+    Rows are processed [block_size] at a time; by default blocks hold about a
+    million pairs, so memory beyond the result stays bounded.
+    """
+    colors = _ucs_rows(colors)
+    others = colors if others is None else _ucs_rows(others)
+    result = np.empty((colors.shape[0], others.shape[0]))
+    rows = _block_rows(others.shape[0], block_size)
+    for start in range(0, colors.shape[0], rows):
+        stop = start + rows
+        result[start:stop] = _delta_e(_squared_distances(colors[start:stop], others))
+    return result
+
+
+def nearest(colors, others, k=1, block_size=None):
+    """
+    Finds the [k] rows of [others] closest to each row of [colors], both (n, 3)
+    arrays of CAM16-UCS coordinates.
+
+    Returns an (n, k) array of indices into [others], nearest first, and the
+    matching (n, k) array of [Cam16.distance]s.
+    """
+    colors = _ucs_rows(colors)
+    others = _ucs_rows(others)
+    if not 1 <= k <= others.shape[0]:
+        raise ValueError(f"k must be between 1 and {others.shape[0]}, got {k}")
+    indices = np.empty((colors.shape[0], k), dtype=np.intp)
+    distances = np.empty((colors.shape[0], k))
+    rows = _block_rows(others.shape[0], block_size)
+    for start in range(0, colors.shape[0], rows):
+        stop = start + rows
+        squared = _squared_distances(colors[start:stop], others)
+        if k < others.shape[0]:
+            candidates = np.argpartition(squared, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(k), squared.shape).copy()
+        candidate_squared = np.take_along_axis(squared, candidates, axis=1)
+        order = np.argsort(candidate_squared, axis=1, kind="stable")
+        indices[start:stop] = np.take_along_axis(candidates, order, axis=1)
+        distances[start:stop] = _delta_e(
+            np.take_along_axis(candidate_squared, order, axis=1)
+        )
+    return indices, distances
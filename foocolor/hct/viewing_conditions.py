@@ -1,6 +1,44 @@
+from functools import cached_property
+from typing import NamedTuple, Tuple
+
 import numpy as np
 
-from ..util.color_util import WHITE_POINT_D65, y_from_lstar
+from ..util.color_util import SRGB_TO_XYZ, WHITE_POINT_D65, y_from_lstar
+
+# Linear sRGB-derived XYZ to CAM16 cone responses.
+CAM16_FROM_XYZ = np.array(
+    [
+        [0.401288, 0.650173, -0.051461],
+        [-0.250268, 1.204414, 0.045854],
+        [-0.002079, 0.048952, 0.953127],
+    ]
+)
+CAM16_FROM_XYZ.flags.writeable = False
+
+
+class Coefficients(NamedTuple):
+    """
+    Quantities that depend only on the viewing conditions, computed once per
+    [ViewingConditions] instead of once per color.
+    """
+
+    # (1.64 - 0.29^n)^0.73, the factor between t^0.9 and alpha.
+    alpha_scale: float
+    # 1 / alpha_scale, as used by the inverse model.
+    t_inner_coeff: float
+    # Exponent taking A / Aw to J / 100, and its inverse.
+    j_exponent: float
+    inverse_j_exponent: float
+    # 50000 / 13 * Nc * Ncb, the hue-independent part of p1.
+    p1_scale: float
+    # Linear sRGB to cone responses with the discount and luminance adaptation
+    # applied, scaled so chromatic adaptation only needs the 0.42 power; and its
+    # inverse. Plain-float rows for the per-color paths, arrays for the batch
+    # paths.
+    scaled_discount_from_linrgb: Tuple[Tuple[float, float, float], ...]
+    linrgb_from_scaled_discount: Tuple[Tuple[float, float, float], ...]
+    scaled_discount_from_linrgb_array: np.ndarray
+    linrgb_from_scaled_discount_array: np.ndarray
 
 
 class ViewingConditions:
@@ -40,6 +78,32 @@ class ViewingConditions:
         self.f_l_root = f_l_root
         self.z = z
 
+    @cached_property
+    def coefficients(self) -> Coefficients:
+        """
+        The derived [Coefficients], computed on first use.
+        """
+        alpha_scale = (1.64 - 0.29**self.background_y_to_white_point_y) ** 0.73
+        scaled_discount = (
+            np.diag(np.array(self.rgb_d) * self.fl / 100.0)
+            @ CAM16_FROM_XYZ
+            @ SRGB_TO_XYZ
+        )
+        linrgb = np.linalg.inv(scaled_discount)
+        scaled_discount.flags.writeable = False
+        linrgb.flags.writeable = False
+        return Coefficients(
+            alpha_scale=alpha_scale,
+            t_inner_coeff=1 / alpha_scale,
+            j_exponent=self.c * self.z,
+            inverse_j_exponent=1.0 / self.c / self.z,
+            p1_scale=(50000.0 / 13.0) * self.nc * self.ncb,
+            scaled_discount_from_linrgb=tuple(map(tuple, scaled_discount.tolist())),
+            linrgb_from_scaled_discount=tuple(map(tuple, linrgb.tolist())),
+            scaled_discount_from_linrgb_array=scaled_discount,
+            linrgb_from_scaled_discount_array=linrgb,
+        )
+
     @classmethod
     def make(
         cls,
@@ -49,8 +113,42 @@ class ViewingConditions:
         surround=2.0,
         discounting_illuminant=False,
     ):
+        """
+        Creates viewing conditions from the observer's environment.
+
+        Instances are memoized by their parameters, so repeated calls are cheap
+        and return the same object.
+        """
         if white_point is None:
             white_point = WHITE_POINT_D65
+        key = (
+            tuple(float(component) for component in white_point),
+            adapting_luminance,
+            background_lstar,
+            surround,
+            discounting_illuminant,
+        )
+        viewing_conditions = _made.get(key)
+        if viewing_conditions is None:
+            viewing_conditions = cls._make(
+                white_point,
+                adapting_luminance,
+                background_lstar,
+                surround,
+                discounting_illuminant,
+            )
+            _made[key] = viewing_conditions
+        return viewing_conditions
+
+    @classmethod
+    def _make(
+        cls,
+        white_point,
+        adapting_luminance,
+        background_lstar,
+        surround,
+        discounting_illuminant,
+    ):
 
         if adapting_luminance <= 0.0:
             adapting_luminance = 200.0 / np.pi * y_from_lstar(50.0) / 100.0
@@ -134,24 +232,28 @@ class ViewingConditions:
 
         aw = (40.0 * rgb_a[0] + 20.0 * rgb_a[1] + rgb_a[2]) / 20.0 * nbb
 
+        # Derived values are stored as plain floats so the per-color paths,
+        # which avoid NumPy, don't promote their arithmetic to NumPy scalars.
         return cls(
             white_point=white_point,
-            adapting_luminance=adapting_luminance,
-            background_lstar=background_lstar,
+            adapting_luminance=float(adapting_luminance),
+            background_lstar=float(background_lstar),
             surround=surround,
             discounting_illuminant=discounting_illuminant,
-            background_y_to_white_point_y=n,
-            aw=aw,
-            nbb=nbb,
-            ncb=ncb,
-            c=c,
-            nc=nc,
+            background_y_to_white_point_y=float(n),
+            aw=float(aw),
+            nbb=float(nbb),
+            ncb=float(ncb),
+            c=float(c),
+            nc=float(nc),
             drgb_inverse=[0.0, 0.0, 0.0],
-            rgb_d=rgb_d,
-            fl=fl,
-            f_l_root=fl**0.25,
-            z=z,
+            rgb_d=[float(component) for component in rgb_d],
+            fl=float(fl),
+            f_l_root=float(fl**0.25),
+            z=float(z),
         )
 
 
+_made = {}
+
 VIEWING_CONDITIONS_STANDARD = VIEWING_CONDITIONS_SRGB = ViewingConditions.make()
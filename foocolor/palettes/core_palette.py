@@ -1,6 +1,6 @@
-from typing import List
+from typing import List, Optional
 
-from ..hct import Cam16
+from ..hct import Cam16, ViewingConditions
 from .tonal_palette import TonalPalette
 
 
@@ -21,48 +21,75 @@ class CorePalette:
         tertiary: TonalPalette,
         neutral: TonalPalette,
         neutral_variant: TonalPalette,
+        error: Optional[TonalPalette] = None,
     ):
         self.primary = primary
         self.secondary = secondary
         self.tertiary = tertiary
         self.neutral = neutral
         self.neutral_variant = neutral_variant
-        self.error = TonalPalette.of(25, 84)
+        self.error = error or TonalPalette.of(25, 84)
 
     @classmethod
-    def of(cls, argb: int) -> "CorePalette":
+    def of(
+        cls, argb: int, viewing_conditions: Optional[ViewingConditions] = None
+    ) -> "CorePalette":
         """
-        Create a [CorePalette] from a source ARGB color.
+        Create a [CorePalette] from a source ARGB color, with hue and chroma as
+        seen under [viewing_conditions].
         """
-        cam = Cam16.from_int(argb)
-        return cls._(cam.hue, cam.chroma)
+        if viewing_conditions is None:
+            cam = Cam16.from_int(argb)
+        else:
+            cam = Cam16.from_int_in_viewing_conditions(argb, viewing_conditions)
+        return cls._(cam.hue, cam.chroma, viewing_conditions)
 
     @classmethod
-    def _(cls, hue: float, chroma: float) -> "CorePalette":
+    def _(
+        cls,
+        hue: float,
+        chroma: float,
+        viewing_conditions: Optional[ViewingConditions] = None,
+    ) -> "CorePalette":
+        vc = viewing_conditions
         return cls(
-            primary=TonalPalette.of(hue, max(48, chroma)),
-            secondary=TonalPalette.of(hue, 16),
-            tertiary=TonalPalette.of(hue + 60, 24),
-            neutral=TonalPalette.of(hue, 4),
-            neutral_variant=TonalPalette.of(hue, 8),
+            primary=TonalPalette.of(hue, max(48, chroma), vc),
+            secondary=TonalPalette.of(hue, 16, vc),
+            tertiary=TonalPalette.of(hue + 60, 24, vc),
+            neutral=TonalPalette.of(hue, 4, vc),
+            neutral_variant=TonalPalette.of(hue, 8, vc),
+            error=TonalPalette.of(25, 84, vc),
         )
 
     @classmethod
-    def content_of(cls, argb: int) -> "CorePalette":
+    def content_of(
+        cls, argb: int, viewing_conditions: Optional[ViewingConditions] = None
+    ) -> "CorePalette":
         """
-        Create a content [CorePalette] from a source ARGB color.
+        Create a content [CorePalette] from a source ARGB color, with hue and
+        chroma as seen under [viewing_conditions].
         """
-        cam = Cam16.from_int(argb)
-        return cls._content_of(cam.hue, cam.chroma)
+        if viewing_conditions is None:
+            cam = Cam16.from_int(argb)
+        else:
+            cam = Cam16.from_int_in_viewing_conditions(argb, viewing_conditions)
+        return cls._content_of(cam.hue, cam.chroma, viewing_conditions)
 
     @classmethod
-    def _content_of(cls, hue: float, chroma: float) -> "CorePalette":
+    def _content_of(
+        cls,
+        hue: float,
+        chroma: float,
+        viewing_conditions: Optional[ViewingConditions] = None,
+    ) -> "CorePalette":
+        vc = viewing_conditions
         return cls(
-            primary=TonalPalette.of(hue, chroma),
-            secondary=TonalPalette.of(hue, chroma / 3),
-            tertiary=TonalPalette.of(hue + 60, chroma / 2),
-            neutral=TonalPalette.of(hue, min(chroma / 12, 4)),
-            neutral_variant=TonalPalette.of(hue, min(chroma / 6, 8)),
+            primary=TonalPalette.of(hue, chroma, vc),
+            secondary=TonalPalette.of(hue, chroma / 3, vc),
+            tertiary=TonalPalette.of(hue + 60, chroma / 2, vc),
+            neutral=TonalPalette.of(hue, min(chroma / 12, 4), vc),
+            neutral_variant=TonalPalette.of(hue, min(chroma / 6, 8), vc),
+            error=TonalPalette.of(25, 84, vc),
         )
 
     @classmethod
@@ -1,6 +1,7 @@
 from typing import List, Optional
 
-from ..hct import Hct
+from ..hct import VIEWING_CONDITIONS_SRGB, Hct, ViewingConditions
+from ..hct.hct_solver import solve_tone_sweep
 
 # Commonly-used tone values.
 common_tones = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 95, 99, 100]
@@ -25,17 +26,25 @@ class TonalPalette:
         hue: Optional[float] = None,
         chroma: Optional[float] = None,
         cache: Optional[List[int]] = None,
+        viewing_conditions: Optional[ViewingConditions] = None,
     ):
         self._hue = hue
         self._chroma = chroma
         self._cache = cache or {}
+        self._viewing_conditions = viewing_conditions or VIEWING_CONDITIONS_SRGB
 
     @classmethod
-    def of(cls, hue: float, chroma: float) -> "TonalPalette":
+    def of(
+        cls,
+        hue: float,
+        chroma: float,
+        viewing_conditions: Optional[ViewingConditions] = None,
+    ) -> "TonalPalette":
         """
-        Create colors using [hue] and [chroma].
+        Create colors using [hue] and [chroma], as seen under
+        [viewing_conditions].
         """
-        return cls(hue=hue, chroma=chroma)
+        return cls(hue=hue, chroma=chroma, viewing_conditions=viewing_conditions)
 
     @classmethod
     def from_list(cls, colors: List[int]) -> "TonalPalette":
@@ -55,7 +64,29 @@ class TonalPalette:
 
         Inverse of [from_list].
         """
-        return [self.get(tone) for tone in common_tones]
+        return self.get_list(common_tones)
+
+    def get_list(self, tones: List[int]) -> List[int]:
+        """
+        Returns the ARGB representations of the HCT colors at each of [tones],
+        as [get] would.
+
+        Tones that aren't cached yet are solved in one sweep per chroma, which
+        shares the hue-dependent work between them.
+        """
+        if self._hue is not None and self._chroma is not None:
+            missing = sorted({tone for tone in tones if tone not in self._cache})
+            below = [tone for tone in missing if tone < 90.0]
+            above = [tone for tone in missing if tone >= 90.0]
+            for chroma, sweep in (
+                (self._chroma, below),
+                (min(self._chroma, 40.0), above),
+            ):
+                argbs = solve_tone_sweep(
+                    self._hue, chroma, sweep, self._viewing_conditions
+                )
+                self._cache.update(zip(sweep, argbs))
+        return [self.get(tone) for tone in tones]
 
     def get(self, tone: int) -> int:
         """
@@ -73,13 +104,21 @@ class TonalPalette:
                     f"{common_tones}"
                 )
             return self._cache[tone]
-        chroma = min(self._chroma, 40.0) if tone >= 90.0 else self._chroma
-        return self._cache.setdefault(tone, Hct.from_(self._hue, chroma, tone).argb)
+        argb = self._cache.get(tone)
+        if argb is None:
+            chroma = min(self._chroma, 40.0) if tone >= 90.0 else self._chroma
+            argb = Hct.from_(self._hue, chroma, tone, self._viewing_conditions).argb
+            self._cache[tone] = argb
+        return argb
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, TonalPalette):
             if self._hue is not None and self._chroma is not None:
-                return self._hue == other._hue and self._chroma == other._chroma
+                return (
+                    self._hue == other._hue
+                    and self._chroma == other._chroma
+                    and self._viewing_conditions is other._viewing_conditions
+                )
             else:
                 return set(self._cache.values()).issubset(set(other._cache.values()))
         return False
@@ -1 +1 @@
-from .celebi import QuantizerCelebi
+from .celebi import QuantizerCelebi, StreamingQuantizerCelebi
@@ -1,8 +1,8 @@
-import time
-
 import numpy as np
 
 from ..util import color_util
+from . import wu
+from .histogram import count_colors, merge_counts
 from .point_provider_lab import PointProviderLab
 from .quantizer import Quantizer, QuantizerResult
 from .wsmeans import QuantizerWsmeans
@@ -10,28 +10,161 @@ from .wu import QuantizerWu
 
 
 class QuantizerCelebi(Quantizer):
-    def __init__(self, pixels: np.ndarray) -> None:
+    def __init__(
+        self, pixels, channel_order: str = "rgba", dtype=np.float64, bits: int = 8
+    ) -> None:
+        """
+        [pixels] is either an (N, 3) or (N, 4) array of channel values, or a
+        buffer of packed 8-bit pixels (bytes, a memoryview, a contiguous uint8
+        image array with 4 channels, a memory-mapped file). Packed buffers are
+        read in place. Pixels that are not fully opaque are ignored.
+
+        [channel_order] is "rgba" or "bgra", and also applies to the first
+        three columns of an array. [dtype] is the precision of the L*a*b*
+        points clustered by [QuantizerWsmeans]. With [bits] below 8, each channel
+        is reduced to its top [bits] bits before the colors are counted, which
+        merges near-identical colors and shortens clustering.
+        """
         super().__init__()
-        self._pixels = (
-            pixels if pixels.shape[-1] == 3 else pixels[pixels[:, 3] == 255][:, :3]
-        ).astype(np.int64)
-        self._pixels = color_util.argb_from_rgb(
-            self._pixels[:, 0], self._pixels[:, 1], self._pixels[:, 2]
-        )
+        self._dtype = np.dtype(dtype)
+        self._bits = bits
+        self._pixels = _argb_from_pixels(pixels, channel_order)
 
     def quantize(
         self,
         max_colors: int,
         return_input_pixel_to_cluster_pixel: bool = False,
     ) -> QuantizerResult:
-        unique_pixels, counts = np.unique(self._pixels, return_counts=True, axis=-1)
-        wu = QuantizerWu(unique_pixels, counts)
-        wu_result = wu.quantize(max_colors)
-        wsmeans = QuantizerWsmeans(unique_pixels, counts)
-        wsmeans_result = wsmeans.quantize(
+        unique_pixels, counts = count_colors(self._pixels, self._bits)
+        return _cluster(
+            unique_pixels,
+            counts,
+            max_colors,
+            self._dtype,
+            return_input_pixel_to_cluster_pixel,
+        )
+
+
+class StreamingQuantizerCelebi:
+    def __init__(
+        self,
+        chunks=(),
+        channel_order: str = "rgba",
+        dtype=np.float64,
+        bits: int = 8,
+    ) -> None:
+        """
+        Quantizes an image too large to hold in memory, fed one chunk of pixels
+        at a time with [update], as [QuantizerCelebi] would quantize all of them
+        at once. [chunks] is an optional iterable of chunks to start with, such
+        as a generator of tiles.
+
+        Only the color counts and Wu's moment histogram are kept, so memory
+        grows with the number of distinct colors, at most 2^24, rather than
+        with the number of pixels. The other arguments are as for
+        [QuantizerCelebi].
+        """
+        self._channel_order = channel_order
+        self._dtype = np.dtype(dtype)
+        self._bits = bits
+        self._histogram = None
+        self._colors = np.zeros(0, dtype=np.uint32)
+        self._counts = np.zeros(0, dtype=np.int64)
+        # Counts of recent chunks, merged into the totals once they are as many
+        # colors as the totals, so each color is merged O(log N) times.
+        self._pending = []
+        self._pending_size = 0
+        for chunk in chunks:
+            self.update(chunk)
+
+    def update(self, chunk) -> "StreamingQuantizerCelebi":
+        """
+        Adds the pixels of [chunk], in any form [QuantizerCelebi] accepts: an
+        array of channel values, or a packed buffer such as a memory-mapped
+        tile. Returns this quantizer.
+        """
+        colors, counts = count_colors(
+            _argb_from_pixels(chunk, self._channel_order), self._bits
+        )
+        histogram = wu.histogram(colors, counts)
+        if self._histogram is None:
+            self._histogram = histogram
+        else:
+            self._histogram += histogram
+        self._pending.append((colors, counts))
+        self._pending_size += colors.shape[0]
+        if self._pending_size >= self._colors.shape[0]:
+            self._merge()
+        return self
+
+    def finalize(
+        self,
+        max_colors: int,
+        return_input_pixel_to_cluster_pixel: bool = False,
+    ) -> QuantizerResult:
+        """
+        Quantizes all pixels added so far. More chunks may still be added and
+        the stream quantized again.
+        """
+        self._merge()
+        return _cluster(
+            self._colors,
+            self._counts,
             max_colors,
-            starting_clusters=list(wu_result.color_to_count.keys()),
-            point_provider=PointProviderLab(),
-            return_input_pixel_to_cluster_pixel=return_input_pixel_to_cluster_pixel,
+            self._dtype,
+            return_input_pixel_to_cluster_pixel,
+            self._histogram,
         )
-        return wsmeans_result
+
+    def _merge(self):
+        if self._pending:
+            self._colors, self._counts = merge_counts(
+                [(self._colors, self._counts)] + self._pending
+            )
+            self._pending = []
+            self._pending_size = 0
+
+
+def _argb_from_pixels(pixels, channel_order):
+    """
+    Returns the fully opaque pixels of [pixels], in any form [QuantizerCelebi]
+    accepts, as an array of ARGB ints.
+    """
+    # A 1-D uint8 array is a packed buffer too, e.g. a memmap of a raw file.
+    if not isinstance(pixels, np.ndarray) or (
+        pixels.dtype == np.uint8
+        and (pixels.ndim == 1 or (pixels.shape[-1] == 4 and pixels.flags.c_contiguous))
+    ):
+        return color_util.argb_from_rgba_buffer(pixels, channel_order, opaque_only=True)
+    if pixels.ndim < 2 or pixels.shape[-1] not in (3, 4):
+        raise ValueError(
+            f"pixels must be a packed buffer or an array of shape (..., 3) or"
+            f" (..., 4), got shape {pixels.shape}"
+        )
+    pixels = pixels.reshape(-1, pixels.shape[-1])
+    pixels = (
+        pixels if pixels.shape[-1] == 3 else pixels[pixels[:, 3] == 255][:, :3]
+    ).astype(np.int64)
+    if channel_order == "bgra":
+        pixels = pixels[:, ::-1]
+    return color_util.argb_from_rgb(pixels[:, 0], pixels[:, 1], pixels[:, 2])
+
+
+def _cluster(
+    unique_pixels,
+    counts,
+    max_colors,
+    dtype,
+    return_input_pixel_to_cluster_pixel,
+    histogram=None,
+):
+    if unique_pixels.shape[0] == 0:
+        return QuantizerResult({})
+    wu_result = QuantizerWu(unique_pixels, counts, histogram).quantize(max_colors)
+    wsmeans = QuantizerWsmeans(unique_pixels, counts, dtype)
+    return wsmeans.quantize(
+        max_colors,
+        starting_clusters=list(wu_result.color_to_count.keys()),
+        point_provider=PointProviderLab(dtype),
+        return_input_pixel_to_cluster_pixel=return_input_pixel_to_cluster_pixel,
+    )
@@ -1,11 +1,19 @@
 import numpy as np
 
+from ..util import color_util
+from .histogram import count_colors
 from .quantizer import Quantizer, QuantizerResult
 
 
 class QuantizerMap(Quantizer):
     def quantize(self, pixels: np.ndarray, max_colors: int) -> QuantizerResult:
-        counts = np.unique(pixels[pixels[:, 3] < 255], return_counts=True)
-        count_by_color = dict(zip(counts[0], counts[1]))
+        """
+        Counts the fully opaque colors of [pixels], an (N, 4) array of RGBA
+        channel values. [max_colors] is unused: every color is kept.
+        """
+        rgb = pixels[pixels[:, 3] == 255][:, :3].astype(np.uint32)
+        argb = color_util.argb_from_rgb(rgb[:, 0], rgb[:, 1], rgb[:, 2])
+        colors, counts = count_colors(argb)
+        count_by_color = dict(zip(colors.tolist(), counts.tolist()))
 
         return QuantizerResult(count_by_color)
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import List
 
+import numpy as np
+
 
 class PointProvider(ABC):
     @abstractmethod
@@ -11,6 +13,14 @@ class PointProvider(ABC):
     def to_int(self, point: List[float]) -> int:
         pass
 
+    def to_int_array(self, points) -> np.ndarray:
+        """
+        Returns a uint32 array of [to_int] applied to each row of the (N, 3)
+        array [points]. Providers should override this with a vectorized
+        conversion.
+        """
+        return np.array([self.to_int(point) for point in points], dtype=np.uint32)
+
     @abstractmethod
     def distance(self, a: List[float], b: List[float]) -> float:
         pass
@@ -1,16 +1,34 @@
 import numpy as np
 
+from ..hct import srgb_table
 from ..util import color_util
 from .point_provider import PointProvider
 
 
 class PointProviderLab(PointProvider):
+    def __init__(self, dtype=np.float64):
+        """
+        Arrays of colors are converted to points of [dtype]; float32 halves the
+        memory the quantizers move per point.
+        """
+        self.dtype = np.dtype(dtype)
+
     def from_int(self, argb):
+        table = srgb_table.get_table()
+        if table is not None:
+            return table.lab(argb).astype(self.dtype, copy=False)
+        if isinstance(argb, np.ndarray) and argb.ndim > 0:
+            return color_util.lab_from_argb_array(argb, dtype=self.dtype)
         return color_util.lab_from_argb(argb)
 
     def to_int(self, lab):
+        if isinstance(lab, np.ndarray) and lab.ndim > 1:
+            return self.to_int_array(lab)
         return color_util.argb_from_lab(lab[0], lab[1], lab[2])
 
+    def to_int_array(self, lab):
+        return color_util.argb_from_lab_array(lab)
+
     def distance(self, one, two):
         # Standard CIE 1976 delta E formula also takes the square root, unneeded
         # here. This method is used by quantization algorithms to compare distance,
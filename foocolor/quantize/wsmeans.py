@@ -6,16 +6,45 @@ from .point_provider import PointProvider
 from .point_provider_lab import PointProviderLab
 from .quantizer import Quantizer, QuantizerResult
 
+# Number of points whose distances to every cluster are held at once by the
+# assignment step, which bounds its scratch memory regardless of the number of
+# unique colors.
+CHUNK_SIZE = 1 << 12
+
 
 class QuantizerWsmeans(Quantizer):
     def __init__(
         self,
         unique_pixels: np.ndarray,
         counts: np.ndarray,
+        dtype=np.float64,
+        chunk_size: int = CHUNK_SIZE,
+        prune: bool = True,
     ) -> None:
+        """
+        Points and clusters are held as [dtype]; pass float32 to halve their
+        memory. Cluster sums are always accumulated in float64.
+
+        Points are assigned to clusters [chunk_size] at a time, so the scratch
+        memory of an iteration is proportional to [chunk_size] times the number
+        of clusters.
+
+        With [prune], each point keeps an upper bound on the distance to its
+        cluster and a lower bound on the distance to any other, carried across
+        iterations by how far the clusters moved (Hamerly's algorithm). Points
+        whose bounds show their cluster is still the nearest skip the distance
+        computation. The result is the same as without pruning.
+        """
         super().__init__()
         self._unique_pixels = unique_pixels
         self._counts = counts
+        self._dtype = np.dtype(dtype)
+        self._chunk_size = chunk_size
+        self._prune = prune
+        # Relative slack on the bounds, covering the rounding of the distances
+        # they are derived from, so that pruning never skips a point that the
+        # full comparison would move.
+        self._tolerance = 64 * np.finfo(self._dtype).eps
 
     def quantize(
         self,
@@ -29,10 +58,12 @@ class QuantizerWsmeans(Quantizer):
             starting_clusters = []
 
         if point_provider is None:
-            point_provider = PointProviderLab()
+            point_provider = PointProviderLab(self._dtype)
 
         point_count = self._unique_pixels.shape[0]
-        points = point_provider.from_int(self._unique_pixels)
+        points = np.asarray(
+            point_provider.from_int(self._unique_pixels), dtype=self._dtype
+        )
 
         cluster_count = min(max_colors, point_count)
 
@@ -45,93 +76,214 @@ class QuantizerWsmeans(Quantizer):
                     .choice(point_count, additional_clusters_needed, replace=False)
                     .astype(np.int32)
                 ],
-            ]
+            ],
+            dtype=self._dtype,
         )
 
         cluster_indices = np.arange(point_count) % cluster_count
+        counts = self._counts
+
+        chunk_size = max(1, min(self._chunk_size, point_count))
+        distances = np.empty((chunk_size, cluster_count), dtype=self._dtype)
+        scratch = np.empty_like(distances)
+        nearest = np.empty(chunk_size, dtype=np.intp)
+        rows = np.arange(chunk_size)
+        buffers = (distances, scratch, nearest, rows)
 
-        pixel_count_sums = np.zeros(cluster_count, dtype=np.int32)
+        # Bounds on each point's distance to its own cluster and to any other,
+        # and half of each cluster's distance to its nearest neighbor. The
+        # bounds are only usable once [half_gaps] is set after an update.
+        upper = np.empty(point_count)
+        lower = np.empty(point_count)
+        half_gaps = None
+
+        pixel_count_sums = np.zeros(cluster_count, dtype=np.int64)
         for iteration in range(max_iterations):
             points_moved = 0
-            distance_to_index_matrix = np.linalg.norm(
-                clusters[:, None, :] - clusters[None, :, :], axis=-1
-            )
-            distance_to_index_matrix.sort()
-
-            previous_clusters = clusters[cluster_indices[:point_count]]
-            previous_distances = np.sum(
-                (points[:point_count] - previous_clusters) ** 2, axis=-1
-            )
-            filtered_clusters = np.broadcast_to(
-                clusters, (points.shape[0], *clusters.shape)
-            )[
-                (
-                    distance_to_index_matrix[cluster_indices[:point_count]]
-                    < 4 * previous_distances[:, None]
+            for start in range(0, point_count, chunk_size):
+                stop = min(start + chunk_size, point_count)
+                points_moved += self._assign_chunk(
+                    points[start:stop],
+                    clusters,
+                    cluster_indices[start:stop],
+                    upper[start:stop],
+                    lower[start:stop],
+                    half_gaps,
+                    buffers,
                 )
-            ][
-                :cluster_count
-            ]
-            distances = np.sum(
-                (points[:, None] - filtered_clusters) ** 2,
+
+            if points_moved == 0 and iteration > 0:
+                break
+
+            pixel_count_sums = np.bincount(
+                cluster_indices, weights=counts, minlength=cluster_count
+            ).astype(np.int64)
+            component_sums = np.stack(
+                [
+                    np.bincount(
+                        cluster_indices,
+                        weights=points[:, component] * counts,
+                        minlength=cluster_count,
+                    )
+                    for component in range(3)
+                ],
                 axis=-1,
             )
-            if distances.size != 0:
-                min_distance_indices = np.argmin(distances, axis=1)
-                min_distances = distances[
-                    np.arange(distances.shape[0]), min_distance_indices
-                ]
-                shorter_distance_indices = np.argwhere(
-                    min_distances < previous_distances
+            previous_clusters = clusters
+            with np.errstate(divide="ignore", invalid="ignore"):
+                clusters = np.where(
+                    (pixel_count_sums == 0)[:, None],
+                    0.0,
+                    component_sums / pixel_count_sums[:, None],
+                ).astype(self._dtype, copy=False)
+            if self._prune:
+                half_gaps = self._update_bounds(
+                    previous_clusters, clusters, cluster_indices, upper, lower
                 )
-                cluster_indices[shorter_distance_indices] = min_distance_indices[
-                    shorter_distance_indices
-                ]
-                points_moved += len(shorter_distance_indices)
 
-            # if len(distances) == 0:
-            #     continue
-
-            if points_moved == 0 and iteration > 0:
-                break
+        # Empty clusters are dropped, and clusters that land on the same ARGB
+        # as an earlier one are merged into it by keeping only the first.
+        argbs = point_provider.to_int_array(clusters)
+        populated = np.flatnonzero(pixel_count_sums)
+        _, first = np.unique(argbs[populated], return_index=True)
+        kept = populated[np.sort(first)]
+        color_to_count = dict(
+            zip(argbs[kept].tolist(), pixel_count_sums[kept].tolist())
+        )
 
-            component_sums = np.zeros((cluster_count, 3), dtype=np.float64)
+        input_pixel_to_cluster_pixel: Optional[Dict[int, int]] = None
+        if return_input_pixel_to_cluster_pixel:
+            input_pixel_to_cluster_pixel = dict(
+                zip(self._unique_pixels.tolist(), argbs[cluster_indices].tolist())
+            )
 
-            pixel_count_sums[:] = 0
-            np.add.at(pixel_count_sums, cluster_indices, self._counts)
-            np.add.at(component_sums, cluster_indices, points * self._counts[:, None])
+        return QuantizerResult(
+            color_to_count,
+            input_pixel_to_cluster_pixel=input_pixel_to_cluster_pixel,
+        )
 
-            clusters = np.where(
-                (pixel_count_sums == 0)[:, None],
-                np.zeros((cluster_count, 3)),
-                component_sums / pixel_count_sums[:, None],
+    def _assign_chunk(
+        self, points, clusters, cluster_indices, upper, lower, half_gaps, buffers
+    ):
+        """
+        [_assign] for the points of one chunk, skipping those whose bounds
+        show their cluster is still the nearest. Returns the number of points
+        moved.
+        """
+        if half_gaps is None:
+            return self._assign(
+                points,
+                clusters,
+                cluster_indices,
+                upper,
+                lower,
+                *(buffer[: points.shape[0]] for buffer in buffers),
+            )
+        # A point's cluster is still its nearest if it is no farther than the
+        # lower bound on every other cluster, or than half the distance from
+        # its cluster to the nearest other one.
+        slack = 1.0 + self._tolerance
+        bound = np.maximum(lower, half_gaps[cluster_indices])
+        candidates = np.flatnonzero(upper * slack > bound)
+        if candidates.size == 0:
+            return 0
+        # The upper bound has grown with every move of the cluster; the exact
+        # distance often settles the point without the other clusters.
+        upper[candidates] = np.sqrt(
+            _squared_distances(
+                points[candidates], clusters[cluster_indices[candidates]]
             )
+        )
+        candidates = candidates[upper[candidates] * slack > bound[candidates]]
+        if candidates.size == 0:
+            return 0
+        count = candidates.shape[0]
+        candidate_indices = cluster_indices[candidates]
+        candidate_upper = upper[candidates]
+        candidate_lower = lower[candidates]
+        moved = self._assign(
+            points[candidates],
+            clusters,
+            candidate_indices,
+            candidate_upper,
+            candidate_lower,
+            *(buffer[:count] for buffer in buffers),
+        )
+        cluster_indices[candidates] = candidate_indices
+        upper[candidates] = candidate_upper
+        lower[candidates] = candidate_lower
+        return moved
 
-        cluster_argbs = []
-        cluster_populations = []
-        input_pixel_to_cluster_pixel: Optional[Dict[int, int]] = None
-        for i in range(cluster_count):
-            count = pixel_count_sums[i]
-            if count == 0:
-                continue
+    @staticmethod
+    def _update_bounds(previous_clusters, clusters, cluster_indices, upper, lower):
+        """
+        Loosens the bounds by how far each cluster moved from
+        [previous_clusters] to [clusters], and returns half of each cluster's
+        distance to its nearest other cluster.
+        """
+        clusters = clusters.astype(np.float64)
+        drift = np.sqrt(
+            _squared_distances(previous_clusters.astype(np.float64), clusters)
+        )
+        upper += drift[cluster_indices]
+        # Any other cluster came at most the largest drift closer; for points
+        # of the cluster that drifted most, at most the second largest.
+        farthest = int(np.argmax(drift))
+        largest = drift[farthest]
+        drift[farthest] = 0.0
+        second = drift.max()
+        lower -= np.where(cluster_indices == farthest, second, largest)
 
-            possible_new_cluster = point_provider.to_int(clusters[i])
-            if possible_new_cluster in cluster_argbs:
-                continue
+        gaps = np.sqrt(
+            np.sum((clusters[:, None, :] - clusters[None, :, :]) ** 2, axis=-1)
+        )
+        np.fill_diagonal(gaps, np.inf)
+        return 0.5 * gaps.min(axis=1)
 
-            cluster_argbs.append(possible_new_cluster)
-            cluster_populations.append(count)
+    @staticmethod
+    def _assign(
+        points,
+        clusters,
+        cluster_indices,
+        upper,
+        lower,
+        distances,
+        scratch,
+        nearest,
+        rows,
+    ):
+        """
+        Moves each of [points] to its nearest cluster, updating [cluster_indices]
+        in place, where that cluster is strictly closer than its current one.
+        Returns the number of points moved.
 
-        if return_input_pixel_to_cluster_pixel:
-            input_pixel_to_cluster_pixel = {}
-            for i in range(len(self._unique_pixels)):
-                input_pixel = self._unique_pixels[i]
-                cluster_index = self._cluster_indices[i]
-                cluster = clusters[cluster_index]
-                cluster_pixel = point_provider.to_int(cluster)
-                input_pixel_to_cluster_pixel[input_pixel] = cluster_pixel
+        [upper] and [lower] are set to the distance to the point's cluster and
+        to the nearest other one. [distances], [scratch], [nearest] and [rows]
+        are buffers with one row per point, reused across calls.
+        """
+        # Squared distances, summed one component at a time so that no
+        # (points, clusters, 3) array is ever formed.
+        np.subtract(points[:, 0, None], clusters[:, 0], out=distances)
+        np.square(distances, out=distances)
+        for component in (1, 2):
+            np.subtract(points[:, component, None], clusters[:, component], out=scratch)
+            np.square(scratch, out=scratch)
+            distances += scratch
+        np.argmin(distances, axis=1, out=nearest)
+        closer = distances[rows, nearest] < distances[rows, cluster_indices]
+        cluster_indices[closer] = nearest[closer]
+        np.sqrt(distances[rows, cluster_indices], out=upper)
+        distances[rows, cluster_indices] = np.inf
+        np.sqrt(distances.min(axis=1), out=lower)
+        return int(np.count_nonzero(closer))
 
-        return QuantizerResult(
-            dict(zip(cluster_argbs, cluster_populations)),
-            input_pixel_to_cluster_pixel=input_pixel_to_cluster_pixel,
-        )
+
+def _squared_distances(a, b):
+    """
+    Returns the squared distances between matching rows of [a] and [b], summed
+    in the same order as the distances of [QuantizerWsmeans._assign].
+    """
+    distances = np.square(a[:, 0] - b[:, 0])
+    distances += np.square(a[:, 1] - b[:, 1])
+    distances += np.square(a[:, 2] - b[:, 2])
+    return distances
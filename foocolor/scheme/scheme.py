@@ -1,5 +1,6 @@
-from typing import NamedTuple
+from typing import NamedTuple, Optional
 
+from ..hct import ViewingConditions
 from ..palettes import CorePalette
 
 
@@ -33,20 +34,32 @@ class Scheme(NamedTuple):
     inverse_primary: int
 
     @classmethod
-    def light(cls, color: int) -> "Scheme":
-        return cls.light_from_core_palette(CorePalette.of(color))
+    def light(
+        cls, color: int, viewing_conditions: Optional[ViewingConditions] = None
+    ) -> "Scheme":
+        return cls.light_from_core_palette(CorePalette.of(color, viewing_conditions))
 
     @classmethod
-    def dark(cls, color: int) -> "Scheme":
-        return cls.dark_from_core_palette(CorePalette.of(color))
+    def dark(
+        cls, color: int, viewing_conditions: Optional[ViewingConditions] = None
+    ) -> "Scheme":
+        return cls.dark_from_core_palette(CorePalette.of(color, viewing_conditions))
 
     @classmethod
-    def light_content(cls, color: int) -> "Scheme":
-        return cls.light_from_core_palette(CorePalette.content_of(color))
+    def light_content(
+        cls, color: int, viewing_conditions: Optional[ViewingConditions] = None
+    ) -> "Scheme":
+        return cls.light_from_core_palette(
+            CorePalette.content_of(color, viewing_conditions)
+        )
 
     @classmethod
-    def dark_content(cls, color: int) -> "Scheme":
-        return cls.dark_from_core_palette(CorePalette.content_of(color))
+    def dark_content(
+        cls, color: int, viewing_conditions: Optional[ViewingConditions] = None
+    ) -> "Scheme":
+        return cls.dark_from_core_palette(
+            CorePalette.content_of(color, viewing_conditions)
+        )
 
     @classmethod
     def light_from_core_palette(cls, palette: CorePalette) -> "Scheme":
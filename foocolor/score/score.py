@@ -2,7 +2,7 @@ from typing import Dict, List
 
 import numpy as np
 
-from ..hct import Hct
+from ..hct import Hct, HctArray
 from ..util.math_util import difference_degrees, sanitize_degrees
 
 
@@ -42,12 +42,13 @@ def score(
     argb_to_raw_proportion = {}
     argb_to_hct = {}
     hue_proportions = np.zeros(360)
-    for color in colors_to_population.keys():
+    colors = HctArray(list(colors_to_population.keys()))
+    for index, color in enumerate(colors_to_population.keys()):
         population = colors_to_population[color]
         proportion = population / population_sum
         argb_to_raw_proportion[color] = proportion
 
-        hct = Hct(color)
+        hct = colors[index]
         argb_to_hct[color] = hct
 
         hue = np.floor(hct.hue).astype(int)
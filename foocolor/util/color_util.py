@@ -33,13 +33,36 @@ XYZ_TO_SRGB.flags.writeable = False
 WHITE_POINT_D65 = np.array([95.047, 100.0, 108.883])
 WHITE_POINT_D65.flags.writeable = False
 
+# Plain-float copies for the per-color paths, which avoid NumPy entirely.
+_SRGB_TO_XYZ_ROWS = SRGB_TO_XYZ.tolist()
+
+# Transfer function tables, built on first use by the functions below.
+_linearized_list = None
+_linearized_table = None
+_delinearized_lookup = None
+
+# Number of colors the chunked array conversions below handle at a time, which
+# bounds their scratch memory regardless of the input size.
+CHUNK_SIZE = 1 << 16
+
 
 def argb_from_rgb(red, green, blue):
     return 255 << 24 | (red & 255) << 16 | (green & 255) << 8 | blue & 255
 
 
 def argb_from_linrgb(linrgb):
-    return argb_from_rgb(*delinearized(linrgb).astype(np.uint8))
+    if not isinstance(linrgb, np.ndarray):
+        return argb_from_rgb(
+            int(delinearized(linrgb[0])),
+            int(delinearized(linrgb[1])),
+            int(delinearized(linrgb[2])),
+        )
+    return argb_from_rgb(*delinearized(linrgb).astype(int).tolist())
+
+
+def argb_from_linrgb_array(linrgb):
+    rgb = delinearized(linrgb).astype(np.uint32)
+    return argb_from_rgb(rgb[..., 0], rgb[..., 1], rgb[..., 2])
 
 
 def alpha_from_argb(argb):
@@ -62,22 +85,148 @@ def rgb_from_argb(argb):
     return np.array([red_from_argb(argb), green_from_argb(argb), blue_from_argb(argb)])
 
 
+def argb_from_rgba_buffer(buffer, channel_order="rgba", opaque_only=False):
+    """
+    Returns the pixels of a packed 8-bit RGBA or BGRA [buffer] as a uint32
+    array of ARGB ints.
+
+    [buffer] is anything exposing the buffer protocol: bytes, a memoryview, a
+    contiguous uint8 array such as an H x W x 4 image, or a memory-mapped file.
+    It is reinterpreted as 32-bit words without copying, so unfiltered BGRA
+    input comes back as a view of [buffer]. With [opaque_only], pixels whose
+    alpha is not 255 are dropped first, so the channel reordering only touches
+    the pixels that are kept.
+    """
+    if channel_order not in ("rgba", "bgra"):
+        raise ValueError(
+            f"channel_order must be 'rgba' or 'bgra', got {channel_order!r}"
+        )
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    if data.shape[0] % 4 != 0:
+        raise ValueError(f"buffer of {data.shape[0]} bytes is not whole 4-byte pixels")
+    # Read as little-endian words, byte 3 (alpha) lands in the top byte on any
+    # host, and BGRA bytes read as ARGB.
+    pixels = data.view(np.dtype("<u4"))
+    if opaque_only:
+        pixels = pixels[pixels >= 0xFF000000]
+    if channel_order == "rgba":
+        # Swapping the red and blue bytes in place turns RGBA into BGRA, with
+        # one byte per pixel of scratch space.
+        if not opaque_only:
+            pixels = pixels.copy()
+        channels = pixels.view(np.uint8).reshape(-1, 4)
+        red = channels[:, 0].copy()
+        channels[:, 0] = channels[:, 2]
+        channels[:, 2] = red
+    return pixels.astype(np.uint32, copy=False)
+
+
+def rgba_buffer_from_argb(argb, channel_order="rgba"):
+    """
+    Returns a uint8 array of packed 8-bit RGBA or BGRA pixels, four bytes per
+    ARGB int in [argb]: the inverse of [argb_from_rgba_buffer].
+    """
+    if channel_order not in ("rgba", "bgra"):
+        raise ValueError(
+            f"channel_order must be 'rgba' or 'bgra', got {channel_order!r}"
+        )
+    channels = np.asarray(argb, dtype="<u4").reshape(-1).view(np.uint8)
+    channels = channels.reshape(-1, 4)
+    if channel_order == "rgba":
+        channels = channels[:, [2, 1, 0, 3]]
+    return channels.copy().reshape(-1)
+
+
+def linearized_rgb_from_argb(argb):
+    """
+    Returns [linearized] of the red, green and blue channels of [argb] as a
+    (3, ...) array, looked up from a 256-entry table.
+    """
+    table = _linearized_table
+    if table is None:
+        table = _build_linearized_table()
+    return np.array(
+        [
+            table[red_from_argb(argb)],
+            table[green_from_argb(argb)],
+            table[blue_from_argb(argb)],
+        ]
+    )
+
+
 def is_opaque(argb):
     return alpha_from_argb(argb) >= 255
 
 
 def argb_from_xyz(x, y, z):
+    if (
+        isinstance(x, np.ndarray)
+        or isinstance(y, np.ndarray)
+        or isinstance(z, np.ndarray)
+    ):
+        return argb_from_xyz_array(np.stack(np.broadcast_arrays(x, y, z), axis=-1))
     matrix = XYZ_TO_SRGB
     linear_rgb = np.dot(matrix, [x, y, z])
-    rgb = delinearized(linear_rgb).astype(np.uint8)
+    # Plain ints, as uint8 components would overflow when shifted into ARGB.
+    rgb = delinearized(linear_rgb).astype(int).tolist()
     return argb_from_rgb(rgb[0], rgb[1], rgb[2])
 
 
+def argb_from_xyz_array(xyz):
+    """
+    Returns a uint32 array of ARGB ints for an (..., 3) array of XYZ colors.
+    """
+    # Out-of-gamut colors have negative components, which take the linear
+    # branch of [delinearized] but still reach the power in the other.
+    with np.errstate(invalid="ignore"):
+        return argb_from_linrgb_array(np.asarray(xyz) @ XYZ_TO_SRGB.T)
+
+
 def xyz_from_argb(argb):
-    return linearized(rgb_from_argb(argb)) @ SRGB_TO_XYZ.T
+    if isinstance(argb, int):
+        table = _linearized_list
+        if table is None:
+            table = _build_linearized_list()
+        r = table[(argb >> 16) & 255]
+        g = table[(argb >> 8) & 255]
+        b = table[argb & 255]
+        m = _SRGB_TO_XYZ_ROWS
+        return (
+            m[0][0] * r + m[0][1] * g + m[0][2] * b,
+            m[1][0] * r + m[1][1] * g + m[1][2] * b,
+            m[2][0] * r + m[2][1] * g + m[2][2] * b,
+        )
+    return np.moveaxis(linearized_rgb_from_argb(argb), 0, -1) @ SRGB_TO_XYZ.T
+
+
+def xyz_from_argb_array(argb, out=None, dtype=np.float64, chunk_size=CHUNK_SIZE):
+    """
+    Returns the XYZ coordinates of an array of ARGB ints as a (..., 3) array of
+    [dtype], written to [out] if given.
+
+    Colors are converted [chunk_size] at a time, so memory beyond [out] stays
+    bounded.
+    """
+    argb = np.asarray(argb)
+    out = _output_for(argb, out, dtype)
+    flat_argb = argb.reshape(-1)
+    flat_out = out.reshape(-1, 3)
+    rgb = np.empty((min(chunk_size, flat_argb.shape[0]), 3), dtype=dtype)
+    matrix = SRGB_TO_XYZ.T.astype(dtype)
+    for start in range(0, flat_argb.shape[0], chunk_size):
+        stop = min(start + chunk_size, flat_argb.shape[0])
+        chunk_rgb = _linearized_rgb_into(flat_argb[start:stop], rgb, dtype)
+        np.matmul(chunk_rgb, matrix, out=flat_out[start:stop])
+    return out
 
 
 def argb_from_lab(l, a, b):
+    if (
+        isinstance(l, np.ndarray)
+        or isinstance(a, np.ndarray)
+        or isinstance(b, np.ndarray)
+    ):
+        return argb_from_lab_array(np.stack(np.broadcast_arrays(l, a, b), axis=-1))
     white_point = WHITE_POINT_D65
     fy = (l + 16.0) / 116.0
     fx = a / 500.0 + fy
@@ -86,8 +235,20 @@ def argb_from_lab(l, a, b):
     return argb_from_xyz(*xyz)
 
 
+def argb_from_lab_array(lab):
+    """
+    Returns a uint32 array of ARGB ints for an (..., 3) array of L*a*b* colors.
+    """
+    lab = np.asarray(lab, dtype=np.float64)
+    fy = (lab[..., 0] + 16.0) / 116.0
+    f = np.stack((lab[..., 1] / 500.0 + fy, fy, fy - lab[..., 2] / 200.0), axis=-1)
+    return argb_from_xyz_array(_lab_invf(f) * WHITE_POINT_D65)
+
+
 def lab_from_argb(argb):
-    rgb = linearized(rgb_from_argb(argb))
+    if isinstance(argb, np.ndarray) and argb.ndim > 0:
+        return lab_from_argb_array(argb)
+    rgb = linearized_rgb_from_argb(argb)
     matrix = SRGB_TO_XYZ
     xyz = np.dot(matrix, rgb).T
     white_point = WHITE_POINT_D65
@@ -96,14 +257,79 @@ def lab_from_argb(argb):
     return np.array([116.0 * fy - 16.0, 500.0 * (fx - fy), 200.0 * (fy - fz)]).T
 
 
+def lab_from_argb_array(argb, out=None, dtype=np.float64, chunk_size=CHUNK_SIZE):
+    """
+    Returns the L*a*b* coordinates of an array of ARGB ints as a (..., 3) array
+    of [dtype], written to [out] if given.
+
+    Colors are converted [chunk_size] at a time, so memory beyond [out] stays
+    bounded. With float32, the whole conversion runs in single precision.
+    """
+    argb = np.asarray(argb)
+    out = _output_for(argb, out, dtype)
+    flat_argb = argb.reshape(-1)
+    flat_out = out.reshape(-1, 3)
+    rgb = np.empty((min(chunk_size, flat_argb.shape[0]), 3), dtype=dtype)
+    xyz = np.empty_like(rgb)
+    matrix = SRGB_TO_XYZ.T.astype(dtype)
+    white_point = WHITE_POINT_D65.astype(dtype)
+    for start in range(0, flat_argb.shape[0], chunk_size):
+        stop = min(start + chunk_size, flat_argb.shape[0])
+        chunk_rgb = _linearized_rgb_into(flat_argb[start:stop], rgb, dtype)
+        chunk_xyz = np.matmul(chunk_rgb, matrix, out=xyz[: stop - start])
+        chunk_xyz /= white_point
+        f = _lab_f(chunk_xyz)
+        chunk_out = flat_out[start:stop]
+        np.subtract(116.0 * f[:, 1], 16.0, out=chunk_out[:, 0])
+        np.multiply(f[:, 0] - f[:, 1], 500.0, out=chunk_out[:, 1])
+        np.multiply(f[:, 1] - f[:, 2], 200.0, out=chunk_out[:, 2])
+    return out
+
+
+def _output_for(argb, out, dtype):
+    shape = (*argb.shape, 3)
+    if out is None:
+        return np.empty(shape, dtype=dtype)
+    if out.shape != shape or out.dtype != dtype or not out.flags.c_contiguous:
+        raise ValueError(
+            f"out must be a contiguous {np.dtype(dtype)} array of shape {shape}"
+        )
+    return out
+
+
+def _linearized_rgb_into(argb, rgb, dtype):
+    table = _linearized_table
+    if table is None:
+        table = _build_linearized_table()
+    if table.dtype != dtype:
+        table = table.astype(dtype)
+    rgb = rgb[: argb.shape[0]]
+    np.take(table, (argb >> 16) & 255, out=rgb[:, 0])
+    np.take(table, (argb >> 8) & 255, out=rgb[:, 1])
+    np.take(table, argb & 255, out=rgb[:, 2])
+    return rgb
+
+
 def argb_from_lstar(lstar):
     y = y_from_lstar(lstar)
+    if isinstance(y, float):
+        component = int(delinearized(y))
+        return argb_from_rgb(component, component, component)
     component = delinearized(y).astype(np.uint8)
     return argb_from_rgb(component, component, component)
 
 
+def argb_from_lstar_array(lstar):
+    component = delinearized(y_from_lstar(np.asarray(lstar))).astype(np.uint32)
+    return argb_from_rgb(component, component, component)
+
+
 def lstar_from_argb(argb):
-    y = xyz_from_argb(argb)[1]
+    xyz = xyz_from_argb(argb)
+    return lstar_from_y(xyz[1] if isinstance(xyz, tuple) else xyz[..., 1])
+
+
+def lstar_from_y(y):
     return 116.0 * _lab_f(y / 100.0) - 16.0
 
 
@@ -112,6 +338,20 @@ def y_from_lstar(lstar):
 
 
 def linearized(rgb_component):
+    if isinstance(rgb_component, (int, float)):
+        normalized = rgb_component / 255.0
+        if normalized <= 0.040449936:
+            return normalized / 12.92 * 100.0
+        return ((normalized + 0.055) / 1.055) ** 2.4 * 100.0
+    if isinstance(rgb_component, np.ndarray) and rgb_component.dtype == np.uint8:
+        table = _linearized_table
+        if table is None:
+            table = _build_linearized_table()
+        return table[rgb_component]
+    return _linearized_array(rgb_component)
+
+
+def _linearized_array(rgb_component):
     normalized = rgb_component / 255.0
     normalized = np.where(
         normalized <= 0.040449936,
@@ -122,6 +362,36 @@ def linearized(rgb_component):
 
 
 def delinearized(rgb):
+    """
+    Returns the 8-bit sRGB component, as a float, of a linear RGB component in
+    [0, 100], or of each element of an array of them.
+
+    Arrays are converted to float64 first, so float32 input gives the same
+    levels as its float64 values. NaN stays NaN.
+    """
+    if isinstance(rgb, float):
+        normalized = rgb / 100.0
+        if normalized <= 0.0031308:
+            delinearized = normalized * 12.92
+        else:
+            delinearized = 1.055 * normalized ** (1.0 / 2.4) - 0.055
+        return float(min(max(round(delinearized * 255.0), 0), 255))
+    # The thresholds are float64, so narrower input is compared at the same
+    # precision as in [_delinearized_array].
+    rgb = np.asarray(rgb, dtype=np.float64)
+    lookup = _delinearized_lookup
+    if lookup is None:
+        lookup = _build_delinearized_lookup()
+    scale, lower_levels, thresholds = lookup
+    # fmax and fmin send NaN to the first bucket instead of propagating it into
+    # the index; it is put back in the result.
+    bucket = np.fmin(np.fmax(rgb * scale, 0.0), lower_levels.shape[0] - 1)
+    level = lower_levels[bucket.astype(np.intp)]
+    level += rgb >= thresholds[level]
+    return np.where(np.isnan(rgb), rgb, level)
+
+
+def _delinearized_array(rgb):
     normalized = rgb / 100.0
     delinearized = np.where(
         normalized <= 0.0031308,
@@ -131,14 +401,72 @@ def delinearized(rgb):
     return np.clip(np.round(delinearized * 255.0), 0, 255)
 
 
+def _build_linearized_list():
+    global _linearized_list
+    _linearized_list = [linearized(component) for component in range(256)]
+    return _linearized_list
+
+
+def _build_linearized_table():
+    global _linearized_table
+    table = _linearized_array(np.arange(256))
+    table.flags.writeable = False
+    _linearized_table = table
+    return table
+
+
+def _build_delinearized_lookup():
+    """
+    Builds the tables [delinearized] uses to map linear components to 8-bit
+    levels without evaluating the transfer function.
+
+    For each level from 1 to 255, the smallest linear component that
+    [_delinearized_array] maps to that level or above is found by bisecting on
+    the bit patterns of non-negative doubles, which order the same way as the
+    doubles, so the thresholds are exact. Inputs are then split into uniform
+    buckets no wider than half the smallest gap between thresholds: each bucket
+    holds at most one threshold, so one comparison against the threshold above
+    the bucket's lowest level finishes the lookup.
+    """
+    global _delinearized_lookup
+    levels = np.arange(1, 256, dtype=np.float64)
+    low = np.zeros(levels.shape[0], dtype=np.int64)
+    high = np.full(levels.shape[0], np.float64(200.0).view(np.int64))
+    while np.any(high - low > 1):
+        mid = low + (high - low) // 2
+        reached = _delinearized_array(mid.view(np.float64)) >= levels
+        high = np.where(reached, mid, high)
+        low = np.where(reached, low, mid)
+    thresholds = high.view(np.float64)
+
+    scale = 2.0 / np.min(np.diff(thresholds, prepend=0.0))
+    bucket_count = int(thresholds[-1] * scale) + 2
+    # Shrink each bucket's start slightly so rounding in rgb * scale can never
+    # place an input below the start of its bucket.
+    bucket_starts = np.arange(bucket_count) / scale * (1.0 - 1e-9)
+    lower_levels = np.searchsorted(thresholds, bucket_starts, side="right")
+    # Nothing compares greater or equal to NaN, not even infinity, so the top
+    # level never moves past 255.
+    thresholds = np.append(thresholds, np.nan)
+    lower_levels.flags.writeable = False
+    thresholds.flags.writeable = False
+    _delinearized_lookup = (scale, lower_levels, thresholds)
+    return _delinearized_lookup
+
+
 def _lab_f(t):
     e = 216.0 / 24389.0
     kappa = 24389.0 / 27.0
+    if isinstance(t, float):
+        return t ** (1.0 / 3.0) if t > e else (kappa * t + 16) / 116
     return np.where(t > e, pow(t, 1.0 / 3.0), (kappa * t + 16) / 116)
 
 
 def _lab_invf(ft):
     e = 216.0 / 24389.0
     kappa = 24389.0 / 27.0
+    if isinstance(ft, float):
+        ft3 = ft**3
+        return ft3 if ft3 > e else (116 * ft - 16) / kappa
     ft3 = np.power(ft, 3)
     return np.where(ft3 > e, ft3, (116 * ft - 16) / kappa)
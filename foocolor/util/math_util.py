@@ -10,3 +10,12 @@ def sanitize_degrees(degrees):
 
 def difference_degrees(a, b):
     return 180.0 - np.abs(np.abs(a - b) - 180.0)
+
+
+def rotation_direction(from_degrees, to_degrees):
+    """
+    Returns 1.0 where the shortest way from [from_degrees] to [to_degrees] is
+    by increasing the angle and -1.0 where it is by decreasing it. Accepts
+    scalars or arrays.
+    """
+    return np.where((to_degrees - from_degrees) % 360.0 <= 180.0, 1.0, -1.0)
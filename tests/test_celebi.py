@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from foocolor.quantize import QuantizerCelebi, StreamingQuantizerCelebi
+
+
+def _image():
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (64, 64, 4), dtype=np.uint8)
+    image[..., :3] //= 32
+    image[..., 3] = 255
+    image[::5, ::3, 3] = 0
+    return image
+
+
+def test_one_dimensional_memmap(tmp_path):
+    image = _image()
+    path = tmp_path / "image.rgba"
+    image.tofile(path)
+    buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    assert buffer.ndim == 1
+
+    expected = QuantizerCelebi(image).quantize(8, True)
+    result = QuantizerCelebi(buffer).quantize(8, True)
+    assert result.color_to_count == expected.color_to_count
+    assert result.input_pixel_to_cluster_pixel == expected.input_pixel_to_cluster_pixel
+
+    streamed = StreamingQuantizerCelebi([buffer[: 4 * 1000], buffer[4 * 1000 :]])
+    assert streamed.finalize(8).color_to_count == expected.color_to_count
+
+
+def test_one_dimensional_buffer_of_partial_pixels():
+    with pytest.raises(ValueError):
+        QuantizerCelebi(np.zeros(6, dtype=np.uint8))
+
+
+@pytest.mark.parametrize(
+    "pixels",
+    [
+        np.zeros(8, dtype=np.int64),
+        np.zeros((4, 5), dtype=np.uint8),
+        np.zeros((4, 2), dtype=np.int64),
+    ],
+)
+def test_invalid_shapes(pixels):
+    with pytest.raises(ValueError):
+        QuantizerCelebi(pixels)
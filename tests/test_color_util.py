@@ -0,0 +1,42 @@
+import numpy as np
+
+from foocolor.util import color_util
+
+
+def _direct(rgb):
+    # The direct computation warns about the invalid powers of negative
+    # components, which both paths clip to 0.
+    with np.errstate(invalid="ignore"):
+        return color_util._delinearized_array(rgb)
+
+
+def _linear_components(dtype):
+    rng = np.random.default_rng(0)
+    rgb = rng.uniform(-5.0, 105.0, 1_000_000).astype(dtype)
+    rgb[:5] = [0.0, 100.0, 0.0031308 * 100.0, -0.0, 1e-12]
+    return rgb
+
+
+def test_delinearized_matches_direct_computation():
+    rgb = _linear_components(np.float64)
+    np.testing.assert_array_equal(color_util.delinearized(rgb), _direct(rgb))
+
+
+def test_delinearized_float32_uses_float64_values():
+    rgb = _linear_components(np.float32)
+    result = color_util.delinearized(rgb)
+    assert result.dtype == np.float64
+    np.testing.assert_array_equal(result, _direct(rgb.astype(np.float64)))
+
+
+def test_delinearized_special_values():
+    rgb = np.array([np.nan, np.inf, -np.inf, 50.0])
+    np.testing.assert_array_equal(
+        color_util.delinearized(rgb), [np.nan, 255.0, 0.0, 188.0]
+    )
+
+
+def test_delinearized_scalars_and_lists():
+    components = [0.0, 0.2, 21.404, 50.0, 100.0]
+    expected = [color_util.delinearized(component) for component in components]
+    np.testing.assert_array_equal(color_util.delinearized(components), expected)
@@ -0,0 +1,29 @@
+import os
+
+import numpy as np
+import pytest
+
+from foocolor.hct import gamut
+
+
+@pytest.fixture
+def fresh_gamut(monkeypatch):
+    monkeypatch.setattr(gamut, "_table", None)
+    monkeypatch.setattr(gamut, "_built", None)
+    monkeypatch.setattr(gamut, "_cell_bounds", [None] * gamut.HUE_COUNT)
+    monkeypatch.setattr(gamut, "_disk_cache_checked", False)
+
+
+def test_disk_cache_is_written_atomically(fresh_gamut, monkeypatch, tmp_path):
+    monkeypatch.setenv("FOOCOLOR_CACHE_DIR", str(tmp_path))
+    gamut._ensure_hues(np.array([10, 11]))
+    assert os.listdir(tmp_path) == [os.path.basename(gamut._cache_file(tmp_path))]
+    np.testing.assert_array_equal(np.load(gamut._cache_file(tmp_path)), gamut._table)
+
+
+def test_unwritable_disk_cache_is_ignored(fresh_gamut, monkeypatch, tmp_path):
+    not_a_directory = tmp_path / "file"
+    not_a_directory.write_bytes(b"")
+    monkeypatch.setenv("FOOCOLOR_CACHE_DIR", str(not_a_directory / "sub"))
+    gamut._ensure_hues(np.array([10, 11]))
+    assert gamut._built.all()
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from foocolor.hct import gamut, hct_solver, solve_memo
+from foocolor.hct.viewing_conditions import ViewingConditions
+
+
+@pytest.fixture(autouse=True)
+def no_memo(monkeypatch):
+    monkeypatch.setattr(solve_memo, "memo", None)
+
+
+def _random_requests(count=2000):
+    rng = np.random.default_rng(0)
+    hue = rng.uniform(-30.0, 390.0, count)
+    chroma = rng.uniform(0.0, 150.0, count)
+    tone = rng.uniform(0.0, 100.0, count)
+    # Edges: achromatic chroma, black, white and the solver's tone cutoffs.
+    hue[:8] = [0.0, 360.0, 359.999, -0.001, 180.0, 90.0, 270.0, 45.0]
+    chroma[:8] = [0.0, 0.00005, 50.0, 50.0, 50.0, 50.0, 50.0, 50.0]
+    tone[:8] = [50.0, 50.0, 0.0, 100.0, 0.00005, 99.99995, 0.0001, 99.9999]
+    return hue, chroma, tone
+
+
+def _boundary_requests(count=2000):
+    # Chromas near the gamut's edge, up to past the shortcut's
+    # conservative bounds, where it and the Newton iteration must agree.
+    rng = np.random.default_rng(1)
+    hue = rng.uniform(0.0, 360.0, count)
+    tone = rng.uniform(1.0, 99.0, count)
+    max_chroma = np.array([gamut.max_chroma(h, t) for h, t in zip(hue, tone)])
+    chroma = max_chroma * rng.uniform(0.9, 1.25, count)
+    return hue, chroma, tone
+
+
+def _scalar(hue, chroma, tone, **kwargs):
+    return np.array(
+        [
+            hct_solver.solve_to_int(h, c, t, **kwargs)
+            for h, c, t in zip(hue.tolist(), chroma.tolist(), tone.tolist())
+        ],
+        dtype=np.uint32,
+    )
+
+
+@pytest.mark.parametrize("requests", [_random_requests, _boundary_requests])
+def test_array_matches_scalar(requests):
+    hue, chroma, tone = requests()
+    np.testing.assert_array_equal(
+        hct_solver.solve_to_int_array(hue, chroma, tone), _scalar(hue, chroma, tone)
+    )
+
+
+@pytest.mark.parametrize("requests", [_random_requests, _boundary_requests])
+def test_clamped_array_matches_scalar(requests):
+    hue, chroma, tone = requests()
+    np.testing.assert_array_equal(
+        hct_solver.solve_to_int_array(hue, chroma, tone, clamp_chroma=True),
+        _scalar(hue, chroma, tone, clamp_chroma=True),
+    )
+
+
+@pytest.mark.parametrize("requests", [_random_requests, _boundary_requests])
+def test_gamut_shortcut_changes_nothing(requests, monkeypatch):
+    hue, chroma, tone = requests()
+    scalar = _scalar(hue, chroma, tone)
+    array = hct_solver.solve_to_int_array(hue, chroma, tone)
+    # Without the shortcut, every chromatic request tries Newton iteration.
+    monkeypatch.setattr(gamut, "is_out_of_gamut", lambda hue, chroma, tone: False)
+    monkeypatch.setattr(
+        gamut,
+        "is_out_of_gamut_array",
+        lambda hue, chroma, tone: np.zeros(np.shape(chroma), dtype=bool),
+    )
+    np.testing.assert_array_equal(_scalar(hue, chroma, tone), scalar)
+    np.testing.assert_array_equal(
+        hct_solver.solve_to_int_array(hue, chroma, tone), array
+    )
+
+
+def test_non_standard_viewing_conditions():
+    viewing_conditions = ViewingConditions.make(background_lstar=30.0)
+    hue, chroma, tone = _random_requests(500)
+    kwargs = {"viewing_conditions": viewing_conditions}
+    np.testing.assert_array_equal(
+        hct_solver.solve_to_int_array(hue, chroma, tone, **kwargs),
+        _scalar(hue, chroma, tone, **kwargs),
+    )
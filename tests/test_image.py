@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from foocolor.hct.image import with_tone
+
+
+def _image():
+    rng = np.random.default_rng(0)
+    palette = rng.integers(0, 256, (64, 4), dtype=np.uint8)
+    return palette[rng.integers(0, palette.shape[0], (32, 48))]
+
+
+def test_sliced_image_matches_contiguous_copy():
+    image = _image()
+    crop = image[3:29, ::2]
+    assert not crop.flags.c_contiguous
+    result = with_tone(crop, lambda tone: 100.0 - tone)
+    assert result.shape == crop.shape
+    np.testing.assert_array_equal(
+        result, with_tone(crop.copy(), lambda tone: 100.0 - tone)
+    )
+    np.testing.assert_array_equal(result[..., 3], crop[..., 3])
+
+
+def test_bytes_match_array():
+    image = _image()
+    result = with_tone(image.tobytes(), lambda tone: 100.0 - tone)
+    np.testing.assert_array_equal(
+        result, with_tone(image, lambda tone: 100.0 - tone).reshape(-1)
+    )
+
+
+def test_rejects_non_uint8_arrays():
+    with pytest.raises(TypeError):
+        with_tone(_image().astype(np.int32), lambda tone: tone)
@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+import pytest
+
+from foocolor.hct import srgb_table
+from foocolor.hct.cam16 import Cam16
+from foocolor.util import color_util
+
+# Builds cover only the first colors, so the test stays fast.
+COLOR_COUNT = 1 << 12
+
+
+@pytest.fixture
+def small_table(monkeypatch):
+    monkeypatch.setattr(srgb_table, "COLOR_COUNT", COLOR_COUNT)
+    srgb_table.use(None)
+    yield
+    srgb_table.use(None)
+
+
+def _colors():
+    rgb = np.arange(COLOR_COUNT, dtype=np.uint32)
+    return rgb | np.uint32(0xFF000000)
+
+
+def test_compute_uses_exact_conversions(small_table):
+    argb = _colors()
+    hue, chroma, lab = srgb_table._compute(argb)
+    cam = Cam16.from_int_array(argb)
+    np.testing.assert_array_equal(hue, cam.hue)
+    np.testing.assert_array_equal(chroma, cam.chroma)
+    np.testing.assert_array_equal(lab, color_util.lab_from_argb_array(argb))
+
+
+def test_fallback_without_table(small_table):
+    argb = _colors()
+    np.testing.assert_array_equal(
+        srgb_table.lab_from_argb_array(argb), color_util.lab_from_argb_array(argb)
+    )
+    hue, chroma, tone = srgb_table.hct_from_argb_array(argb)
+    cam = Cam16.from_int_array(argb)
+    np.testing.assert_array_equal(hue, cam.hue)
+    np.testing.assert_array_equal(tone, color_util.lab_from_argb_array(argb)[:, 0])
+
+
+def test_build_and_use(small_table, tmp_path):
+    path = str(tmp_path / "table.bin")
+    srgb_table.build(path, chunk_size=1000)
+    assert not os.path.exists(f"{path}.tmp")
+
+    argb = _colors()
+    srgb_table.use(path)
+    expected = color_util.lab_from_argb_array(argb).astype(np.float32)
+    np.testing.assert_array_equal(srgb_table.lab_from_argb_array(argb), expected)
+
+    # Building with a table in use still computes the values.
+    rebuilt = str(tmp_path / "rebuilt.bin")
+    srgb_table.build(rebuilt, chunk_size=1000)
+    with open(path, "rb") as a, open(rebuilt, "rb") as b:
+        assert a.read() == b.read()
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from foocolor.quantize.point_provider_lab import PointProviderLab
+from foocolor.quantize.wsmeans import QuantizerWsmeans
+from foocolor.quantize.wu import QuantizerWu
+
+
+def _clustered_colors(seed, count):
+    rng = np.random.default_rng(seed)
+    centers = rng.integers(0, 256, (24, 3))
+    rgb = centers[rng.integers(0, centers.shape[0], count)]
+    rgb = np.clip(rgb + rng.normal(0.0, 24.0, rgb.shape), 0, 255).astype(np.uint32)
+    argb = np.unique(0xFF000000 | rgb[:, 0] << 16 | rgb[:, 1] << 8 | rgb[:, 2])
+    rng.shuffle(argb)
+    return argb, rng.integers(1, 64, argb.shape[0])
+
+
+def _quantize(pixels, counts, max_colors, starting_clusters, dtype, **kwargs):
+    return QuantizerWsmeans(pixels, counts, dtype, **kwargs).quantize(
+        max_colors,
+        starting_clusters=starting_clusters,
+        point_provider=PointProviderLab(dtype),
+        return_input_pixel_to_cluster_pixel=True,
+    )
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize(
+    "seed, count, max_colors, chunk_size",
+    [(0, 20000, 16, 4096), (1, 20000, 64, 1000), (2, 3000, 128, 257)],
+)
+def test_pruning_matches_exact_assignment(seed, count, max_colors, chunk_size, dtype):
+    pixels, counts = _clustered_colors(seed, count)
+    starting_clusters = list(
+        QuantizerWu(pixels, counts).quantize(max_colors).color_to_count
+    )
+    exact = _quantize(pixels, counts, max_colors, starting_clusters, dtype, prune=False)
+    pruned = _quantize(
+        pixels,
+        counts,
+        max_colors,
+        starting_clusters,
+        dtype,
+        prune=True,
+        chunk_size=chunk_size,
+    )
+    assert pruned.color_to_count == exact.color_to_count
+    assert pruned.input_pixel_to_cluster_pixel == exact.input_pixel_to_cluster_pixel
+
+
+def test_pruning_without_starting_clusters():
+    pixels, counts = _clustered_colors(3, 5000)
+    exact = _quantize(pixels, counts, 32, None, np.float64, prune=False)
+    pruned = _quantize(pixels, counts, 32, None, np.float64, prune=True)
+    assert pruned.color_to_count == exact.color_to_count
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from foocolor.quantize.wu import QuantizerWu
+
+
+def _clustered_colors(seed, count):
+    rng = np.random.default_rng(seed)
+    centers = rng.integers(0, 256, (12, 3))
+    rgb = centers[rng.integers(0, centers.shape[0], count)]
+    rgb = np.clip(rgb + rng.normal(0.0, 20.0, rgb.shape), 0, 255).astype(np.uint32)
+    argb = np.unique(0xFF000000 | rgb[:, 0] << 16 | rgb[:, 1] << 8 | rgb[:, 2])
+    return argb, rng.integers(1, 100, argb.shape[0])
+
+
+# Palettes of the scanline implementation the vectorized one replaced, in
+# the order the boxes were created.
+PALETTES = [
+    (
+        0,
+        2000,
+        8,
+        [
+            0xFF2C281D, 0xFFC8AB08, 0xFF2BC6BA, 0xFFD62A15,
+            0xFFB2A6D5, 0xFFC39F7B, 0xFF89E55C, 0xFFDB0D8B,
+        ],
+    ),
+    (
+        1,
+        5000,
+        16,
+        [
+            0xFF1F6167, 0xFFC81D39, 0xFF160CDD, 0xFFD1EF3C,
+            0xFF47D434, 0xFF2072F2, 0xFFC82263, 0xFF67A98C,
+            0xFFBDB28E, 0xFF7883C6, 0xFF6B8492, 0xFFCF5977,
+            0xFFF31027, 0xFF50DD79, 0xFF4AD659, 0xFFC2DE86,
+        ],
+    ),
+    (
+        2,
+        50,
+        32,
+        [
+            0xFF019A3C, 0xFF5346E4, 0xFF8E85AE, 0xFF77025B,
+            0xFF99FF73, 0xFFF122F0, 0xFFB6FE69, 0xFF4293E8,
+            0xFFF9CCCC, 0xFF25963F, 0xFF783126, 0xFF007C48,
+            0xFFBD7BC7, 0xFF2AB6FD, 0xFFDC5100, 0xFFABDBB0,
+            0xFF0D8A54, 0xFF884D0F, 0xFF61A1F9, 0xFFF847C1,
+            0xFF32A250, 0xFFFFD8A0, 0xFF97301C, 0xFF681A44,
+            0xFF56A1E0, 0xFF9F68B5, 0xFFD17ADE, 0xFF186648,
+            0xFF1A7C66, 0xFF3F922F, 0xFF762F56, 0xFF41A0D5,
+        ],
+    ),
+]  # fmt: skip
+
+
+@pytest.mark.parametrize("seed, count, max_colors, palette", PALETTES)
+def test_known_palettes(seed, count, max_colors, palette):
+    pixels, counts = _clustered_colors(seed, count)
+    result = QuantizerWu(pixels, counts).quantize(max_colors)
+    assert list(result.color_to_count) == palette
+
+
+def test_boxes_that_cannot_be_cut():
+    pixels = np.array([0xFF102030, 0xFF102031, 0xFFF0E0D0], dtype=np.uint32)
+    result = QuantizerWu(pixels, np.array([5, 1, 3])).quantize(8)
+    assert list(result.color_to_count) == [0xFF102030, 0xFFF0E0D0]